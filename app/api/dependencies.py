@@ -0,0 +1,42 @@
+"""
+NASA Biology RAG - API Dependencies
+Dependencias compartidas para inyectar en los endpoints con Depends().
+"""
+from fastapi import Header, HTTPException, Request, status
+from typing import Optional
+from app.db.mongo_repo import MongoRepository, get_mongo_repo
+from app.core.settings import get_settings
+import asyncio
+import secrets
+
+# Serializa la creación perezosa del repo: requests concurrentes no crean un cliente cada uno
+_repo_lock = asyncio.Lock()
+
+
+async def repo_dep(request: Request) -> MongoRepository:
+    """
+    Repositorio MongoDB del proceso (clientes PyMongo + Motor ya conectados).
+    Se crea en el startup (app.state.repo); si el warmup falló se crea acá una vez,
+    en un thread (el constructor hace un ping síncrono), y queda en app.state.
+    """
+    repo = getattr(request.app.state, "repo", None)
+    if repo is None:
+        async with _repo_lock:
+            # Otro request pudo crearlo mientras se esperaba el lock
+            repo = getattr(request.app.state, "repo", None)
+            if repo is None:
+                repo = await asyncio.to_thread(get_mongo_repo)
+                request.app.state.repo = repo
+    return repo
+
+
+async def admin_key_dep(x_admin_key: Optional[str] = Header(None)) -> None:
+    """
+    Endpoints de mantenimiento: exigen el header X-Admin-Key == ADMIN_API_KEY.
+    Sin ADMIN_API_KEY configurada quedan deshabilitados (403).
+    """
+    settings = get_settings()
+    if not settings.ADMIN_API_KEY:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin endpoints are disabled")
+    if not x_admin_key or not secrets.compare_digest(x_admin_key, settings.ADMIN_API_KEY):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid admin key")
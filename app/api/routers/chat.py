@@ -1,8 +1,10 @@
 """
 NASA Biology RAG - Chat Router
-Endpoint POST /api/chat
+Endpoints POST /api/chat y POST /api/chat/stream
 """
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, Header, HTTPException, status
+from fastapi.responses import StreamingResponse
+from typing import AsyncIterator, Optional
 from app.schemas.chat import ChatRequest, ChatResponse
 from app.services.rag.pipeline_advanced import get_rag_pipeline
 import logging
@@ -13,7 +15,10 @@ router = APIRouter(prefix="/api", tags=["chat"])
 
 
 @router.post("/chat", response_model=ChatResponse, summary="NASA Biology RAG Chat")
-async def chat(request: ChatRequest):
+async def chat(
+    request: ChatRequest,
+    x_no_cache: Optional[str] = Header(None, description="Si está presente, omite el semantic cache"),
+):
     """
     🚀 **NASA Biology RAG - Chat Endpoint**
     
@@ -86,6 +91,7 @@ async def chat(request: ChatRequest):
     - **filters** (opcional): Filtros facetados para retrieval
     - **top_k** (opcional, default=8): Número de chunks a recuperar (1-20)
     - **session_id** (opcional): ID para tracking de sesión
+    - **X-No-Cache** (header opcional): fuerza retrieval + síntesis sin usar el semantic cache
     
     ---
     
@@ -105,13 +111,64 @@ async def chat(request: ChatRequest):
             filters=request.filters,
             top_k=request.top_k,
             session_id=request.session_id,
+            use_cache=x_no_cache is None,
         )
         logger.info(f"✅ Response generated: {len(response.citations)} citations")
         return response
     
     except Exception as e:
-        logger.error(f"❌ Chat error: {e}", exc_info=True)
+        logger.error("❌ Chat error: %s", e)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Chat error traceback", exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Internal error: {str(e)}",
         )
+
+
+@router.post("/chat/stream", summary="NASA Biology RAG Chat (streaming SSE)")
+async def chat_stream(
+    request: ChatRequest,
+    x_no_cache: Optional[str] = Header(None, description="Si está presente, omite el semantic cache"),
+):
+    """
+    🚀 **NASA Biology RAG - Chat Streaming**
+    
+    Mismo request que `POST /api/chat`, pero la respuesta se emite como
+    Server-Sent Events (`text/event-stream`) a medida que el LLM genera tokens:
+    
+    ```
+    data: {"delta": "Studies show that microgravity"}
+    
+    data: {"delta": " exposure leads to...[1]"}
+    
+    event: done
+    data: {"answer": "...", "citations": [...], "metrics": {...}, "session_id": null}
+    ```
+    
+    Si ocurre un error durante la generación se emite `event: error` con `{"detail": "..."}`.
+    """
+    logger.info(f"📨 Chat stream request: {request.query[:100]}...")
+    pipeline = get_rag_pipeline()
+    
+    async def event_stream() -> AsyncIterator[str]:
+        try:
+            async for frame in pipeline.answer_stream(
+                query=request.query,
+                filters=request.filters,
+                top_k=request.top_k,
+                session_id=request.session_id,
+                use_cache=x_no_cache is None,
+            ):
+                yield frame
+        except Exception as e:
+            logger.error("❌ Chat stream error: %s", e)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Chat stream error traceback", exc_info=True)
+            yield pipeline._sse({"detail": f"Internal error: {str(e)}"}, event="error")
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -2,7 +2,7 @@
 NASA Biology RAG - Diagnostic Router
 Endpoints /diag/* para health, embeddings, retrieval, audit.
 """
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Header, HTTPException, Query, Response
 from app.schemas.diag import (
     HealthResponse,
     EmbeddingRequest,
@@ -13,12 +13,20 @@ from app.schemas.diag import (
     AuditResponse,
     AuditResult,
 )
-from app.core.settings import settings
+from app.schemas.chat import FilterFacets
+from app.core.settings import get_settings
 from app.services.rag.repository import get_repository_service
-from app.services.rag.pipeline import get_rag_pipeline
+from app.services.rag.pipeline_advanced import get_rag_pipeline
+from app.services.rag.semantic_cache import get_semantic_cache
+from typing import Literal, Optional
+import asyncio
 import httpx
+import numpy as np
 import logging
 import json
+import tempfile
+import uuid
+from functools import lru_cache
 from pathlib import Path
 from time import time
 
@@ -26,13 +34,35 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/diag", tags=["diagnostics"])
 
+# Máximo de retrievals simultáneos en el audit (< maxPoolSize de MongoClient)
+AUDIT_MAX_CONCURRENCY = 8
+
+# Checkpoint incremental de /diag/retrieval_audit (?resume=<run_id>): un archivo por audit,
+# una línea JSON por query completada (append). Audits concurrentes (o de otros workers) no
+# comparten archivo; el lock serializa los appends del proceso
+AUDIT_CHECKPOINT_DIR = Path(tempfile.gettempdir())
+AUDIT_RUN_ID_PATTERN = r"^[0-9a-f]{32}$"
+_audit_checkpoint_lock = asyncio.Lock()
+
+# Caracteres de `text` retornados por /diag/retrieval (truncado en la proyección de MongoDB)
+RETRIEVAL_TEXT_LIMIT = 500
+
+# Queries doradas para /diag/retrieval_audit
+GOLDEN_QUERIES_PATH = Path("CONTEXT/golden_queries.json")
+
+# Snapshot de /diag/mongo/health: {exact: (timestamp, response)}
+MONGO_HEALTH_CACHE_TTL = 15  # segundos
+_MONGO_HEALTH_CACHE: dict = {}
+_MONGO_HEALTH_LOCK = asyncio.Lock()
+
 
 @router.get("/health", response_model=HealthResponse)
 async def health():
     """Health check del servicio"""
+    settings = get_settings()
     try:
         repo_service = get_repository_service()
-        is_healthy = repo_service.health_check()
+        is_healthy = await asyncio.to_thread(repo_service.health_check)
         
         return HealthResponse(
             status="ok" if is_healthy else "degraded",
@@ -44,6 +74,8 @@ async def health():
             },
             nasa_mode=settings.NASA_MODE,
             guided_enabled=settings.NASA_GUIDED_ENABLED,
+            cache=get_semantic_cache().stats(),
+            mongo_pool=repo_service.repo.async_pool_stats.stats(),
         )
     except Exception as e:
         logger.error(f"❌ Health check error: {e}")
@@ -58,19 +90,44 @@ async def health():
 
 
 @router.post("/emb", response_model=EmbeddingResponse)
-async def get_embedding(request: EmbeddingRequest):
-    """Generar embedding de un texto usando OpenAI (debug)"""
+async def get_embedding(
+    request: EmbeddingRequest,
+    precision: Literal["fp32", "fp16", "int8"] = Query(
+        "fp32",
+        description="fp32 (default), fp16 (~2x menos bytes) o int8 con escala compartida (~4x menos)",
+    ),
+):
+    """
+    Generar embedding de un texto usando OpenAI (debug)
+    
+    **Formato según `precision`:**
+    - `fp32`: floats tal como los retorna el modelo
+    - `fp16`: floats redondeados a half precision
+    - `int8`: enteros en [-127, 127] + `scale`; valor original ≈ `embedding[i] * scale`
+    """
     try:
         from app.services.embeddings import get_embeddings_service
         
         emb_service = get_embeddings_service()
-        embedding = emb_service.encode_query(request.text)
+        embedding = await emb_service.aencode_query(request.text)
+        dimensions = len(embedding)
+        scale = None
+        
+        if precision == "fp16":
+            embedding = np.asarray(embedding, dtype=np.float32).astype(np.float16).tolist()
+        elif precision == "int8":
+            values = np.asarray(embedding, dtype=np.float32)
+            max_abs = float(np.abs(values).max()) if dimensions else 0.0
+            scale = max_abs / 127 if max_abs > 0 else 1.0
+            embedding = np.round(values / scale).astype(np.int8).tolist()
         
         return EmbeddingResponse(
             text=request.text,
             embedding=embedding,
-            model=settings.EMBEDDING_MODEL,
-            dimensions=len(embedding),
+            model=get_settings().EMBEDDING_MODEL,
+            dimensions=dimensions,
+            precision=precision,
+            scale=scale,
         )
     
     except Exception as e:
@@ -78,44 +135,101 @@ async def get_embedding(request: EmbeddingRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/emb_raw", response_class=Response)
+async def get_embedding_raw(request: EmbeddingRequest):
+    """
+    Embedding como bytes float32 little-endian (`application/octet-stream`),
+    sin serialización JSON. Dimensiones en el header `X-Embedding-Dimensions`.
+    """
+    try:
+        from app.services.embeddings import get_embeddings_service
+        
+        emb_service = get_embeddings_service()
+        embedding = await emb_service.aencode_query(request.text)
+        
+        return Response(
+            content=np.asarray(embedding, dtype="<f4").tobytes(),
+            media_type="application/octet-stream",
+            headers={
+                "X-Embedding-Model": get_settings().EMBEDDING_MODEL,
+                "X-Embedding-Dimensions": str(len(embedding)),
+            },
+        )
+    
+    except Exception as e:
+        logger.error(f"❌ Embedding error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@lru_cache(maxsize=128)
+def _filters_from_json(filters_json: str) -> FilterFacets:
+    """FilterFacets validado una vez por combinación de filtros (JSON canónico)"""
+    return FilterFacets(**json.loads(filters_json))
+
+
+def _build_filters(filters: Optional[dict]) -> Optional[FilterFacets]:
+    """Filtros del request → FilterFacets (None si no hay filtros)"""
+    if not filters:
+        return None
+    return _filters_from_json(json.dumps(filters, sort_keys=True))
+
+
+def _chunk_to_retrieval(chunk: dict) -> RetrievalChunk:
+    """
+    Chunk del retriever → RetrievalChunk sin re-validar (datos internos de confianza).
+    """
+    get = chunk.get
+    return RetrievalChunk.model_construct(
+        source_id=get("source_id", ""),
+        title=get("title", ""),
+        section=get("section"),
+        doi=get("doi"),
+        osdr_id=get("osdr_id"),
+        similarity=get("final_score", 0.0),
+        text=get("text", "")[:RETRIEVAL_TEXT_LIMIT],  # Ya truncado en MongoDB
+        metadata={
+            "organism": get("organism"),
+            "mission_env": get("mission_env"),
+            "year": get("year"),
+            "exposure": get("exposure"),
+        },
+    )
+
+
 @router.post("/retrieval", response_model=RetrievalResponse)
-async def test_retrieval(request: RetrievalRequest):
+async def test_retrieval(
+    request: RetrievalRequest,
+    x_no_cache: Optional[str] = Header(None, description="Si está presente, omite el semantic cache"),
+):
     """Test de retrieval (sin síntesis LLM)"""
     try:
         start = time()
         pipeline = get_rag_pipeline()
         
-        # Generar embedding (síncrono, rápido)
-        query_vec = pipeline._get_embedding(request.query)
+        # Generar embedding
+        query_vec = await pipeline._get_embedding(request.query)
         
-        # Retrieval
-        from app.schemas.chat import FilterFacets
-        filters_obj = FilterFacets(**request.filters) if request.filters else None
+        # Semantic cache (mismos filtros/top_k)
+        use_cache = x_no_cache is None and get_settings().SEMANTIC_CACHE_ENABLED
+        cache_namespace = f"retrieval:{request.top_k}:{json.dumps(request.filters or {}, sort_keys=True)}"
+        chunks = get_semantic_cache().get(query_vec, namespace=cache_namespace) if use_cache else None
         
-        chunks = pipeline.retriever.retrieve(
-            query_vec=query_vec,
-            filters=filters_obj,
-            top_k=request.top_k,
-        )
+        if chunks is None:
+            # Retrieval
+            filters_obj = _build_filters(request.filters)
+            
+            chunks = await asyncio.to_thread(
+                pipeline.retriever.retrieve,
+                query_vec=query_vec,
+                filters=filters_obj,
+                top_k=request.top_k,
+                text_limit=RETRIEVAL_TEXT_LIMIT,
+            )
+            if use_cache:
+                get_semantic_cache().set(query_vec, chunks, namespace=cache_namespace)
         
         # Formatear response
-        retrieval_chunks = []
-        for chunk in chunks:
-            retrieval_chunks.append(RetrievalChunk(
-                source_id=chunk.get("source_id", ""),
-                title=chunk.get("title", ""),
-                section=chunk.get("section"),
-                doi=chunk.get("doi"),
-                osdr_id=chunk.get("osdr_id"),
-                similarity=chunk.get("final_score", 0.0),
-                text=chunk.get("text", "")[:500],  # Limitar texto
-                metadata={
-                    "organism": chunk.get("organism"),
-                    "mission_env": chunk.get("mission_env"),
-                    "year": chunk.get("year"),
-                    "exposure": chunk.get("exposure"),
-                },
-            ))
+        retrieval_chunks = [_chunk_to_retrieval(chunk) for chunk in chunks]
         
         latency = (time() - start) * 1000
         
@@ -131,59 +245,189 @@ async def test_retrieval(request: RetrievalRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@lru_cache(maxsize=1)
+def _parse_golden(path: str, mtime: float) -> tuple:
+    """Parsear golden queries una vez por versión del archivo (mtime)"""
+    with open(path, "r") as f:
+        golden_queries = json.load(f)
+    
+    for query_data in golden_queries:
+        query_data["expected_sources"] = frozenset(query_data["expected_sources"])
+    return tuple(golden_queries)
+
+
+def _load_golden() -> Optional[tuple]:
+    """Golden queries con expected_sources como frozenset (None si no existe el archivo)"""
+    try:
+        mtime = GOLDEN_QUERIES_PATH.stat().st_mtime
+    except FileNotFoundError:
+        return None
+    return _parse_golden(str(GOLDEN_QUERIES_PATH), mtime)
+
+
+def _sources_to_mask(sources, src_to_bit: dict[str, int]) -> int:
+    """Codificar un conjunto de source_ids como bitmask (int de Python, tamaño arbitrario)"""
+    mask = 0
+    for source in sources:
+        mask |= 1 << src_to_bit[source]
+    return mask
+
+
+def _checkpoint_key(query_data: dict) -> str:
+    """Huella de una golden query: un checkpoint solo vale si query y filtros no cambiaron"""
+    return json.dumps([query_data["query"], query_data.get("filters")], sort_keys=True)
+
+
+def _audit_checkpoint_path(run_id: str) -> Path:
+    """Checkpoint de un audit: `audit_cache.<run_id>.jsonl` en el directorio temporal"""
+    return AUDIT_CHECKPOINT_DIR / f"audit_cache.{run_id}.jsonl"
+
+
+def _load_audit_checkpoint(run_id: str) -> Optional[dict]:
+    """{query_id: {"key": ..., "retrieved": [...]}} del audit `run_id` (None si no existe)"""
+    checkpoint = {}
+    try:
+        with open(_audit_checkpoint_path(run_id), "r") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # Línea cortada por un crash a mitad de escritura: esa query se repite
+                checkpoint[record["id"]] = {"key": record["key"], "retrieved": record["retrieved"]}
+    except FileNotFoundError:
+        return None
+    return checkpoint
+
+
+def _append_audit_checkpoint(run_id: str, record: dict) -> None:
+    """Agregar una query completada (una línea, un solo write en modo append)"""
+    with open(_audit_checkpoint_path(run_id), "a") as f:
+        f.write(json.dumps(record) + "\n")
+
+
+async def _embed_all(pipeline, golden_queries: list) -> list[list[float]]:
+    """Fase 1: embeddings de todas las queries en una sola llamada (batch)"""
+    return await pipeline._get_embeddings_batch([q["query"] for q in golden_queries])
+
+
+async def _retrieve_all(
+    pipeline,
+    golden_queries: list,
+    query_vecs: list[list[float]],
+    checkpoint: dict,
+    run_id: str,
+) -> None:
+    """
+    Fase 2: retrieval concurrente (acotado por semáforo). Cada query completada
+    se persiste en el checkpoint del audit, así un reintento con ?resume=<run_id> la omite.
+    """
+    semaphore = asyncio.Semaphore(AUDIT_MAX_CONCURRENCY)
+
+    async def _one(query_data: dict, query_vec: list[float]) -> None:
+        filters_obj = _build_filters(query_data.get("filters"))
+
+        async with semaphore:
+            chunks = await asyncio.to_thread(
+                pipeline.retriever.retrieve,
+                query_vec=query_vec,
+                filters=filters_obj,
+                top_k=8,
+            )
+
+        entry = {
+            "key": _checkpoint_key(query_data),
+            "retrieved": sorted(set(c.get("source_id", "") for c in chunks)),
+        }
+        checkpoint[query_data["id"]] = entry
+        async with _audit_checkpoint_lock:
+            await asyncio.to_thread(_append_audit_checkpoint, run_id, {"id": query_data["id"], **entry})
+
+    await asyncio.gather(*[_one(q, v) for q, v in zip(golden_queries, query_vecs)])
+
+
+def _score(golden_queries: tuple, checkpoint: dict) -> list[AuditResult]:
+    """Fase 3: recall/precision@k con bitsets (un bit por source_id del universo expected ∪ retrieved)"""
+    retrieved_per_query = [set(checkpoint[q["id"]]["retrieved"]) for q in golden_queries]
+
+    src_to_bit: dict[str, int] = {}
+    for query_data, retrieved_sources in zip(golden_queries, retrieved_per_query):
+        for source in query_data["expected_sources"]:
+            src_to_bit.setdefault(source, len(src_to_bit))
+        for source in retrieved_sources:
+            src_to_bit.setdefault(source, len(src_to_bit))
+
+    results = []
+    for query_data, retrieved_sources in zip(golden_queries, retrieved_per_query):
+        expected_sources = query_data["expected_sources"]
+        expected_mask = _sources_to_mask(expected_sources, src_to_bit)
+        retrieved_mask = _sources_to_mask(retrieved_sources, src_to_bit)
+
+        # Calcular recall y precision
+        tp = (expected_mask & retrieved_mask).bit_count()
+        recall = tp / len(expected_sources) if expected_sources else 0.0
+        precision = tp / len(retrieved_sources) if retrieved_sources else 0.0
+
+        missing = [
+            s for s in expected_sources
+            if not (retrieved_mask >> src_to_bit[s]) & 1
+        ]
+
+        results.append(AuditResult(
+            query_id=query_data["id"],
+            recall_at_k=round(recall, 3),
+            precision_at_k=round(precision, 3),
+            retrieved=list(retrieved_sources),
+            expected=list(expected_sources),
+            missing=missing,
+        ))
+    return results
+
+
 @router.post("/retrieval_audit", response_model=AuditResponse)
-async def retrieval_audit():
+async def retrieval_audit(
+    resume: Optional[str] = Query(
+        None,
+        pattern=AUDIT_RUN_ID_PATTERN,
+        description="run_id de un audit anterior: reusar las queries que ya completó",
+    ),
+):
     """
     Audit de retrieval usando queries doradas.
     Lee CONTEXT/golden_queries.json y evalúa recall@k.
+    
+    Cada audit tiene su `run_id` (en la respuesta) y su propio checkpoint
+    (`audit_cache.<run_id>.jsonl` en el directorio temporal), así audits concurrentes
+    no se pisan. Si el audit falla a mitad de camino, `?resume=<run_id>` solo
+    re-ejecuta las queries pendientes.
     """
     try:
-        # Cargar golden queries
-        golden_path = Path("CONTEXT/golden_queries.json")
-        if not golden_path.exists():
+        # Cargar golden queries (cacheadas hasta que cambie el archivo)
+        golden_queries = _load_golden()
+        if golden_queries is None:
             logger.warning("⚠️ golden_queries.json not found, returning empty audit")
             return AuditResponse(queries=[], avg_recall=0.0, avg_precision=0.0)
         
-        with open(golden_path, "r") as f:
-            golden_queries = json.load(f)
+        if resume:
+            run_id = resume
+            checkpoint = await asyncio.to_thread(_load_audit_checkpoint, run_id)
+            if checkpoint is None:
+                raise HTTPException(status_code=404, detail=f"Audit checkpoint not found: {run_id}")
+        else:
+            run_id = uuid.uuid4().hex
+            checkpoint = {}
+        pending = [
+            q for q in golden_queries
+            if checkpoint.get(q["id"], {}).get("key") != _checkpoint_key(q)
+        ]
+        if resume:
+            logger.info(f"♻️ Audit resume {run_id}: {len(golden_queries) - len(pending)} done, {len(pending)} pending")
         
-        pipeline = get_rag_pipeline()
-        results = []
+        if pending:
+            pipeline = get_rag_pipeline()
+            query_vecs = await _embed_all(pipeline, pending)
+            await _retrieve_all(pipeline, pending, query_vecs, checkpoint, run_id)
         
-        for query_data in golden_queries:
-            query_id = query_data["id"]
-            query_text = query_data["query"]
-            expected_sources = set(query_data["expected_sources"])
-            filters = query_data.get("filters")
-            
-            # Retrieval
-            query_vec = await pipeline._get_embedding(query_text)
-            from app.schemas.chat import FilterFacets
-            filters_obj = FilterFacets(**filters) if filters else None
-            
-            chunks = pipeline.retriever.retrieve(
-                query_vec=query_vec,
-                filters=filters_obj,
-                top_k=8,
-            )
-            
-            retrieved_sources = set(c.get("source_id", "") for c in chunks)
-            
-            # Calcular recall y precision
-            tp = len(expected_sources & retrieved_sources)
-            recall = tp / len(expected_sources) if expected_sources else 0.0
-            precision = tp / len(retrieved_sources) if retrieved_sources else 0.0
-            
-            missing = list(expected_sources - retrieved_sources)
-            
-            results.append(AuditResult(
-                query_id=query_id,
-                recall_at_k=round(recall, 3),
-                precision_at_k=round(precision, 3),
-                retrieved=list(retrieved_sources),
-                expected=list(expected_sources),
-                missing=missing,
-            ))
+        results = _score(golden_queries, checkpoint)
         
         # Promedios
         avg_recall = sum(r.recall_at_k for r in results) / len(results) if results else 0.0
@@ -192,23 +436,35 @@ async def retrieval_audit():
         logger.info(f"📊 Audit: avg_recall={avg_recall:.2f}, avg_precision={avg_precision:.2f}")
         
         return AuditResponse(
+            run_id=run_id,
             queries=results,
             avg_recall=round(avg_recall, 3),
             avg_precision=round(avg_precision, 3),
         )
     
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"❌ Audit error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/mongo/health")
-async def mongodb_health():
+async def mongodb_health(
+    exact: bool = Query(False, description="Conteo exacto de documentos (count_documents, lento en colecciones grandes)"),
+    fresh: bool = Query(False, description="Ignorar el snapshot cacheado y consultar MongoDB"),
+):
     """
     🔍 **Health check detallado de MongoDB**
     
     Verifica la conexión, acceso a la base de datos, y estado del cluster.
     
+    Por defecto `documents_in_collection` usa `estimated_document_count()` (metadata
+    de la colección, O(1)). Usar `?exact=true` para un conteo exacto.
+    
+    La respuesta se sirve desde un snapshot cacheado durante
+    `MONGO_HEALTH_CACHE_TTL` segundos; usar `?fresh=true` para forzar una consulta.
+    
     **Response:**
     ```json
     {
@@ -229,9 +485,27 @@ async def mongodb_health():
     }
     ```
     """
+    cached = _MONGO_HEALTH_CACHE.get(exact)
+    if not fresh and cached and time() - cached[0] < MONGO_HEALTH_CACHE_TTL:
+        return cached[1]
+    
+    async with _MONGO_HEALTH_LOCK:
+        # Otro request pudo refrescar el snapshot mientras esperábamos el lock
+        cached = _MONGO_HEALTH_CACHE.get(exact)
+        if not fresh and cached and time() - cached[0] < MONGO_HEALTH_CACHE_TTL:
+            return cached[1]
+        
+        response = await _check_mongodb_health(exact)
+        if response.get("status") == "connected":
+            _MONGO_HEALTH_CACHE[exact] = (time(), response)
+        return response
+
+
+async def _check_mongodb_health(exact: bool) -> dict:
+    """Ejecuta los subchecks de MongoDB y construye la respuesta de /diag/mongo/health"""
+    settings = get_settings()
     try:
         from app.db.mongo_repo import get_mongo_repo
-        from time import time
         
         logger.info("🔍 Checking MongoDB health...")
         start = time()
@@ -239,79 +513,87 @@ async def mongodb_health():
         # Obtener repositorio
         repo = get_mongo_repo()
         
+        db = repo.client[settings.MONGODB_DB]
+        
+        def _count_documents() -> int:
+            if exact:
+                return repo.collection.count_documents({})
+            return repo.collection.estimated_document_count()
+        
+        # Subchecks independientes en paralelo (cada uno es un round-trip al cluster)
+        (
+            ping_result,
+            server_info,
+            connection_info,
+            collections,
+            doc_count,
+            indexes,
+            db_stats,
+        ) = await asyncio.gather(
+            asyncio.to_thread(repo.client.admin.command, 'ping'),
+            asyncio.to_thread(repo.client.server_info),
+            asyncio.to_thread(repo.client.admin.command, 'whatsmyuri'),
+            asyncio.to_thread(db.list_collection_names),
+            asyncio.to_thread(_count_documents),
+            asyncio.to_thread(lambda: list(repo.collection.list_indexes())),
+            asyncio.to_thread(db.command, 'dbStats'),
+            return_exceptions=True,
+        )
+        
         # Test 1: Ping básico
-        try:
-            ping_result = repo.client.admin.command('ping')
-            ping_ok = ping_result.get('ok') == 1
-        except Exception as e:
-            logger.error(f"❌ MongoDB ping failed: {e}")
+        if isinstance(ping_result, Exception):
+            logger.error(f"❌ MongoDB ping failed: {ping_result}")
             return {
                 "status": "error",
-                "error": f"Connection failed: {str(e)}",
+                "error": f"Connection failed: {str(ping_result)}",
                 "connection_type": settings.VECTOR_BACKEND,
                 "database": settings.MONGODB_DB,
                 "collection": settings.MONGODB_COLLECTION,
             }
+        ping_ok = ping_result.get('ok') == 1
         
         # Test 2: Server info
-        try:
-            server_info = repo.client.server_info()
+        if isinstance(server_info, Exception):
+            version = f"error: {server_info}"
+        else:
             version = server_info.get('version', 'unknown')
-        except Exception as e:
-            version = f"error: {e}"
         
-        # Test 3: Obtener host conectado
-        try:
-            connection_info = repo.client.admin.command('whatsmyuri')
+        # Test 3: Host conectado
+        if isinstance(connection_info, Exception):
+            connected_host = f"error: {connection_info}"
+        else:
             connected_host = connection_info.get('you', 'unknown')
-        except Exception as e:
-            connected_host = f"error: {e}"
         
         # Test 4: Database stats
-        try:
-            db = repo.client[settings.MONGODB_DB]
-            
-            # Lista de colecciones
-            collections = db.list_collection_names()
-            collections_count = len(collections)
-            
-            # Contar documentos en la colección principal
-            if settings.MONGODB_COLLECTION in collections:
-                doc_count = repo.collection.count_documents({})
-                
-                # Contar índices
-                indexes = list(repo.collection.list_indexes())
-                indexes_count = len(indexes)
-                index_names = [idx.get('name') for idx in indexes]
-            else:
-                doc_count = 0
-                indexes_count = 0
-                index_names = []
-                logger.warning(f"⚠️ Collection '{settings.MONGODB_COLLECTION}' not found")
-            
-            # Database stats generales
-            db_stats = db.command('dbStats')
-            db_size = db_stats.get('dataSize', 0)
-            
-        except Exception as e:
-            logger.error(f"❌ Error getting DB stats: {e}")
-            collections_count = 0
+        if isinstance(collections, Exception):
+            logger.error(f"❌ Error listing collections: {collections}")
+            collections = []
+        collections_count = len(collections)
+        
+        if isinstance(doc_count, Exception):
+            logger.error(f"❌ Error counting documents: {doc_count}")
+            doc_count = 0
+        
+        if isinstance(indexes, Exception):
+            logger.warning(f"⚠️ Could not list indexes: {indexes}")
+            indexes = []
+        
+        if settings.MONGODB_COLLECTION not in collections:
+            logger.warning(f"⚠️ Collection '{settings.MONGODB_COLLECTION}' not found")
             doc_count = 0
-            indexes_count = 0
-            index_names = []
+            indexes = []
+        
+        indexes_count = len(indexes)
+        index_names = [idx.get('name') for idx in indexes]
+        
+        if isinstance(db_stats, Exception):
+            logger.error(f"❌ Error getting DB stats: {db_stats}")
             db_size = 0
+        else:
+            db_size = db_stats.get('dataSize', 0)
         
         # Test 5: Vector index status
-        vector_index_exists = False
-        try:
-            if settings.MONGODB_COLLECTION in collections:
-                indexes = list(repo.collection.list_indexes())
-                vector_index_exists = any(
-                    idx.get('name') == settings.MONGODB_VECTOR_INDEX 
-                    for idx in indexes
-                )
-        except Exception as e:
-            logger.warning(f"⚠️ Could not check vector index: {e}")
+        vector_index_exists = settings.MONGODB_VECTOR_INDEX in index_names
         
         # Calcular latencia
         latency_ms = round((time() - start) * 1000, 2)
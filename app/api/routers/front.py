@@ -3,9 +3,14 @@ Frontend API Router - Adaptado a estructura real de MongoDB
 Endpoints para operaciones del frontend (listado, búsqueda, filtrado)
 independientes del chatbot RAG.
 """
-from fastapi import APIRouter, Query, HTTPException
-from typing import Optional, List
+from fastapi import APIRouter, Depends, Header, Query, HTTPException, Response
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from pydantic import BaseModel
+from typing import AsyncIterator, Literal, Optional, List, Dict, Tuple
+import asyncio
+import hashlib
 import logging
+import orjson
 
 from app.schemas.front import (
     DocumentListResponse,
@@ -14,20 +19,179 @@ from app.schemas.front import (
     FilterValuesResponse,
     DocumentDetailResponse,
     DocumentMetadata,
-    DocumentChunk,
-    ArticleMetadata,
     StatisticsResponse
 )
-from app.db.mongo_repo import get_mongo_repo
+from app.schemas.front_builders import build_meta, build_metas, build_chunks
+from app.db.mongo_repo import MongoRepository
+from app.api.dependencies import admin_key_dep, repo_dep
+from app.core.settings import get_settings
+from app.utils.redis_cache import cache_get_json, cache_set_json, cache_delete
 
 logger = logging.getLogger(__name__)
-router = APIRouter(prefix="/api/front", tags=["frontend"])
+router = APIRouter(prefix="/api/front", tags=["frontend"], default_response_class=ORJSONResponse)
+
+# Claves del cache de /filters y /stats (Redis, o en memoria sin REDIS_URL): solo cambian con cada ingesta
+FILTERS_CACHE_KEY = "front:filters:v1"
+STATS_CACHE_KEY = "front:stats:v1"
+COUNT_CACHE_PREFIX = "front:count:v1:"
+
+# Filtros de igualdad de SearchFilters -> campo en MongoDB (tags y search_text van aparte)
+SEARCH_FILTER_FIELDS = {
+    "category": "metadata.category",
+    "source_type": "source_type",
+    "pmc_id": "metadata.article_metadata.pmc_id",
+}
+
+# Cómo calcular `total` en los listados keyset: recontar, cache TTL, o no calcularlo
+CountMode = Literal["exact", "cached", "none"]
+COUNT_MODE_DESCRIPTION = "Total: exact (recontar), cached (cache de FRONT_COUNT_CACHE_TTL s) o none (sin total)"
+
+# Subrutas estáticas de /documents: nunca son un pk (ej: GET /documents/search es POST-only)
+RESERVED_DOCUMENT_PATHS = frozenset({"paginated", "search", "by-category", "by-tags"})
+
+# Valores por defecto de /filter-values si MongoDB no responde
+DEFAULT_CATEGORIES = (
+    "general", "mission", "nasa", "physics", "planets",
+    "science", "space", "technology"
+)
+DEFAULT_SOURCE_TYPES = ("article",)
+
+# Cache HTTP (navegador / CDN) para listados que el frontend re-consulta seguido
+FRONT_CACHE_CONTROL = "public, max-age=60, stale-while-revalidate=300"
+
+
+def _weak_etag(*parts) -> str:
+    """ETag débil a partir de valores serializables (hash corto del JSON)"""
+    digest = hashlib.blake2b(orjson.dumps(parts), digest_size=8).hexdigest()
+    return f'W/"{digest}"'
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Comparación débil de If-None-Match (ignora el prefijo W/)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+
+def _not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": FRONT_CACHE_CONTROL})
+
+
+def _model_response(model: BaseModel, headers: Optional[Dict[str, str]] = None) -> ORJSONResponse:
+    """
+    Serializar con orjson directamente: al devolver un Response, FastAPI no vuelve a
+    volcar y validar el modelo contra response_model (que queda para OpenAPI).
+    Los campos None se omiten (muchos papers no tienen pmc_id, doi, statistics...).
+    """
+    return ORJSONResponse(model.model_dump(exclude_none=True), headers=headers)
+
+
+def _stats_response(stats: dict, if_none_match: Optional[str]) -> Response:
+    """/stats con ETag del propio contenido (304 si el cliente ya lo tiene)"""
+    etag = _weak_etag("stats", stats)
+    if _etag_matches(if_none_match, etag):
+        return _not_modified(etag)
+    return ORJSONResponse(stats, headers={"ETag": etag, "Cache-Control": FRONT_CACHE_CONTROL})
+
+
+async def _get_filter_values_cached(repo: MongoRepository) -> dict:
+    """repo.get_filter_values() con cache en Redis / memoria (TTL FRONT_CACHE_TTL)"""
+    filter_values = await cache_get_json(FILTERS_CACHE_KEY)
+    if filter_values is not None:
+        return filter_values
+    
+    filter_values = await repo.get_filter_values()
+    if filter_values:  # {} = error de MongoDB, no cachear
+        await cache_set_json(FILTERS_CACHE_KEY, filter_values, get_settings().FRONT_CACHE_TTL)
+    return filter_values
+
+
+def _count_cache_key(filters: dict) -> str:
+    """Clave de cache del total para una combinación de filtros (hash del JSON ordenado)"""
+    return COUNT_CACHE_PREFIX + hashlib.blake2b(
+        orjson.dumps(filters, option=orjson.OPT_SORT_KEYS), digest_size=8
+    ).hexdigest()
+
+
+async def _count_papers_cached(repo: MongoRepository, filters: Optional[dict], exact: bool = False) -> int:
+    """
+    Total de papers para un filtro. Sin filtro sale de /filters (vista materializada);
+    con filtro se cachea FRONT_COUNT_CACHE_TTL segundos por combinación de filtros.
+    `exact` recuenta en MongoDB y refresca el cache.
+    Las búsquedas de texto libre ($text, o $or de $regex sin índice de texto) no se
+    cachean: casi nunca se repiten y cada una ocuparía una clave propia.
+    """
+    text_search = bool(filters) and ("$text" in filters or "$or" in filters)
+    if exact or text_search:
+        total = await repo.count_unique_papers(filters=filters)
+        if filters and not text_search:
+            await cache_set_json(_count_cache_key(filters), total, get_settings().FRONT_COUNT_CACHE_TTL)
+        return total
+    
+    if not filters:
+        filter_values = await _get_filter_values_cached(repo)
+        if filter_values:
+            return filter_values.get("total_documents", 0)
+        return await repo.count_unique_papers()
+    
+    key = _count_cache_key(filters)
+    total = await cache_get_json(key)
+    if total is None:
+        total = await repo.count_unique_papers(filters=filters)
+        await cache_set_json(key, total, get_settings().FRONT_COUNT_CACHE_TTL)
+    return total
+
+
+async def _get_papers_page(
+    repo: MongoRepository,
+    skip: int,
+    limit: int,
+    after: Optional[str] = None,
+    filters: Optional[dict] = None,
+    count_mode: CountMode = "cached",
+) -> Tuple[List[DocumentMetadata], Optional[int], Optional[str]]:
+    """
+    Página de papers + total + next_cursor.
+    Con FRONT_KEYSET_PAGINATION se pagina por rango de pk (`after`) en vez de `skip`;
+    `count_mode="none"` no calcula el total (None).
+    """
+    if not get_settings().FRONT_KEYSET_PAGINATION:
+        # Página y total en una sola agregación ($facet)
+        papers, total = await repo.get_unique_papers_page(skip=skip, limit=limit, filters=filters)
+        return build_metas(papers), total, None
+    
+    # El total se cuenta en paralelo mientras se consume el cursor de la página
+    total_task = None
+    if count_mode != "none":
+        total_task = asyncio.create_task(_count_papers_cached(repo, filters, exact=count_mode == "exact"))
+    try:
+        paper_list = [
+            build_meta(paper)
+            async for paper in repo.iter_unique_papers_keyset(after=after, skip=skip, limit=limit, filters=filters)
+        ]
+    except BaseException:
+        # Sin página no hace falta el total: no dejar el conteo corriendo huérfano
+        if total_task is not None:
+            total_task.cancel()
+        raise
+    total = await total_task if total_task is not None else None
+    
+    # Página completa => puede haber más: el último pk es el cursor de la siguiente
+    next_cursor = paper_list[-1].pk if len(paper_list) == limit else None
+    return paper_list, total, next_cursor
 
 
 @router.get("/documents", response_model=DocumentListResponse)
 async def list_documents(
     skip: int = Query(0, ge=0, description="Número de documentos a saltar"),
-    limit: int = Query(20, ge=1, le=100, description="Número de documentos por página")
+    limit: int = Query(20, ge=1, le=100, description="Número de documentos por página"),
+    after: Optional[str] = Query(None, description="Cursor keyset: next_cursor de la página anterior"),
+    count_mode: CountMode = Query("cached", description=COUNT_MODE_DESCRIPTION),
+    if_none_match: Optional[str] = Header(None),
+    repo: MongoRepository = Depends(repo_dep)
 ):
     """
     📄 **Listar todos los documentos únicos**
@@ -35,9 +199,17 @@ async def list_documents(
     Retorna lista paginada de documentos (papers) sin duplicados.
     Cada documento incluye metadata principal.
     
+    Con `FRONT_KEYSET_PAGINATION` activo los documentos se ordenan por `pk` y la
+    respuesta incluye `next_cursor`; pasarlo como `?after=` evita el costo de `skip`
+    en páginas profundas.
+    
+    Incluye `ETag` + `Cache-Control`: con `If-None-Match` y sin cambios en la
+    colección responde `304 Not Modified` sin consultar la página a MongoDB.
+    
     **Ejemplo:**
     ```
-    GET /api/front/documents?skip=0&limit=20
+    GET /api/front/documents?limit=20
+    GET /api/front/documents?limit=20&after=mice-in-bion-m-1-space-mission
     ```
     
     **Respuesta:**
@@ -54,47 +226,34 @@ async def list_documents(
           "tags": ["mice", "space", "mission"],
           "total_chunks": 55
         }
-      ]
+      ],
+      "next_cursor": "mice-in-bion-m-1-space-mission"
     }
     ```
     """
     try:
-        logger.info(f"📄 Listing papers: skip={skip}, limit={limit}")
-        
-        repo = get_mongo_repo()
-        papers = repo.get_unique_papers(skip=skip, limit=limit)
-        total = repo.count_unique_papers()
-        
-        # Convertir a schema
-        paper_list = []
-        for paper in papers:
-            # Extraer metadata
-            article_meta = paper.get("article_metadata", {})
-            
-            article_metadata_obj = None
-            if article_meta:
-                article_metadata_obj = ArticleMetadata(
-                    url=article_meta.get("url"),
-                    title=article_meta.get("title"),
-                    authors=article_meta.get("authors", []),
-                    scraped_at=article_meta.get("scraped_at"),
-                    pmc_id=article_meta.get("pmc_id"),
-                    doi=article_meta.get("doi"),
-                    statistics=article_meta.get("statistics")
-                )
-            
-            paper_list.append(DocumentMetadata(
-                pk=paper.get("pk", "unknown"),
-                title=article_meta.get("title") if article_meta else None,
-                source_type=paper.get("source_type"),
-                source_url=paper.get("source_url"),
-                category=paper.get("category"),
-                tags=paper.get("tags", []),
-                total_chunks=paper.get("total_chunks", 0),
-                article_metadata=article_metadata_obj
-            ))
-        
-        return DocumentListResponse(total=total, documents=paper_list)
+        logger.info(f"📄 Listing papers: skip={skip}, limit={limit}, after={after}")
+        
+        # Versión de la colección (version de la vista materializada) + parámetros de la página
+        filter_values = await _get_filter_values_cached(repo)
+        headers = None
+        if filter_values:
+            etag = _weak_etag(
+                "documents",
+                filter_values.get("version"),
+                skip, limit, after, count_mode, get_settings().FRONT_KEYSET_PAGINATION,
+            )
+            if _etag_matches(if_none_match, etag):
+                return _not_modified(etag)
+            headers = {"ETag": etag, "Cache-Control": FRONT_CACHE_CONTROL}
+        
+        paper_list, total, next_cursor = await _get_papers_page(
+            repo, skip=skip, limit=limit, after=after, count_mode=count_mode
+        )
+        
+        return _model_response(
+            DocumentListResponse(total=total, documents=paper_list, next_cursor=next_cursor), headers
+        )
         
     except Exception as e:
         logger.error(f"❌ Error listing documents: {e}")
@@ -105,7 +264,10 @@ async def list_documents(
 async def search_documents(
     filters: SearchFilters,
     skip: int = Query(0, ge=0),
-    limit: int = Query(20, ge=1, le=100)
+    limit: int = Query(20, ge=1, le=100),
+    after: Optional[str] = Query(None, description="Cursor keyset: next_cursor de la página anterior"),
+    count_mode: CountMode = Query("cached", description=COUNT_MODE_DESCRIPTION),
+    repo: MongoRepository = Depends(repo_dep)
 ):
     """
     🔍 **Buscar documentos con filtros**
@@ -128,59 +290,31 @@ async def search_documents(
     - `search_text`: Búsqueda de texto en título/contenido/tags
     - `pmc_id`: ID de PubMed Central
     - `source_type`: Tipo de fuente (article, etc)
+    
+    Paginación keyset con `?after=<next_cursor>` (igual que `GET /documents`).
     """
     try:
-        logger.info(f"🔍 Searching papers with filters: {filters.model_dump(exclude_none=True)}")
-        
-        repo = get_mongo_repo()
-        
-        # Convertir filtros a MongoDB query format
-        filter_dict = filters.model_dump(exclude_none=True)
+        # Convertir filtros a MongoDB query format (atributos directos, sin model_dump)
         mongo_filters = {}
         
-        if "category" in filter_dict:
-            mongo_filters["metadata.category"] = filter_dict["category"]
-        if "tags" in filter_dict:
-            mongo_filters["metadata.tags"] = {"$in": filter_dict["tags"]}
-        if "source_type" in filter_dict:
-            mongo_filters["source_type"] = filter_dict["source_type"]
-        if "pmc_id" in filter_dict:
-            mongo_filters["metadata.article_metadata.pmc_id"] = filter_dict["pmc_id"]
+        for field, mongo_field in SEARCH_FILTER_FIELDS.items():
+            value = getattr(filters, field)
+            if value is not None:
+                mongo_filters[mongo_field] = value
+        if filters.tags:
+            mongo_filters["metadata.tags"] = {"$in": filters.tags}
+        if filters.search_text:
+            # $text sobre front_text_search (o $regex si la colección no tiene índice de texto)
+            mongo_filters.update(repo.text_search_filter(filters.search_text))
+        
+        logger.info(f"🔍 Searching papers with filters: {mongo_filters}")
         
         # Buscar papers únicos
-        papers = repo.get_unique_papers(skip=skip, limit=limit, filters=mongo_filters)
-        total = repo.count_unique_papers(filters=mongo_filters)
-        
-        # Convertir a schema
-        paper_list = []
-        for paper in papers:
-            # Extraer metadata
-            article_meta = paper.get("article_metadata", {})
-            
-            article_metadata_obj = None
-            if article_meta:
-                article_metadata_obj = ArticleMetadata(
-                    url=article_meta.get("url"),
-                    title=article_meta.get("title"),
-                    authors=article_meta.get("authors", []),
-                    scraped_at=article_meta.get("scraped_at"),
-                    pmc_id=article_meta.get("pmc_id"),
-                    doi=article_meta.get("doi"),
-                    statistics=article_meta.get("statistics")
-                )
-            
-            paper_list.append(DocumentMetadata(
-                pk=paper.get("pk", "unknown"),
-                title=article_meta.get("title") if article_meta else None,
-                source_type=paper.get("source_type"),
-                source_url=paper.get("source_url"),
-                category=paper.get("category"),
-                tags=paper.get("tags", []),
-                total_chunks=paper.get("total_chunks", 0),
-                article_metadata=article_metadata_obj
-            ))
-        
-        return DocumentListResponse(total=total, documents=paper_list)
+        paper_list, total, next_cursor = await _get_papers_page(
+            repo, skip=skip, limit=limit, after=after, count_mode=count_mode, filters=mongo_filters
+        )
+        
+        return _model_response(DocumentListResponse(total=total, documents=paper_list, next_cursor=next_cursor))
         
     except Exception as e:
         logger.error(f"❌ Error searching documents: {e}")
@@ -196,59 +330,53 @@ async def get_documents_paginated(
     page: int = Query(1, ge=1, description="Número de página (empezando en 1)"),
     page_size: int = Query(20, ge=1, le=100, description="Documentos por página"),
     category: Optional[str] = Query(None, description="Filtrar por categoría"),
-    source_type: Optional[str] = Query(None, description="Filtrar por tipo de fuente")
+    source_type: Optional[str] = Query(None, description="Filtrar por tipo de fuente"),
+    after: Optional[str] = Query(None, description="Cursor keyset: next_cursor de la página anterior (ignora el offset de page)"),
+    count_mode: CountMode = Query("cached", description=COUNT_MODE_DESCRIPTION),
+    if_none_match: Optional[str] = Header(None),
+    repo: MongoRepository = Depends(repo_dep)
 ):
-    """Paginación mejorada de documentos con filtros opcionales"""
+    """
+    Paginación mejorada de documentos con filtros opcionales.
+    Para avanzar página a página conviene `?after=<next_cursor>`: el costo no crece con `page`.
+    Soporta `If-None-Match` (igual que `GET /documents`).
+    """
     try:
-        skip = (page - 1) * page_size
-        logger.info(f"📄 Getting paginated papers: page={page}, size={page_size}")
+        # Con cursor la página ya está posicionada: no hace falta saltar documentos
+        skip = 0 if after is not None else (page - 1) * page_size
+        logger.info(f"📄 Getting paginated papers: page={page}, size={page_size}, after={after}")
         
-        repo = get_mongo_repo()
         filters = {}
         if category:
             filters["metadata.category"] = category
         if source_type:
             filters["source_type"] = source_type
         
-        papers = repo.get_unique_papers(skip=skip, limit=page_size, filters=filters)
-        total = repo.count_unique_papers(filters=filters)
-        total_pages = (total + page_size - 1) // page_size
-        
-        paper_list = []
-        for paper in papers:
-            # Extraer metadata
-            article_meta = paper.get("article_metadata", {})
-            
-            article_metadata_obj = None
-            if article_meta:
-                article_metadata_obj = ArticleMetadata(
-                    url=article_meta.get("url"),
-                    title=article_meta.get("title"),
-                    authors=article_meta.get("authors", []),
-                    scraped_at=article_meta.get("scraped_at"),
-                    pmc_id=article_meta.get("pmc_id"),
-                    doi=article_meta.get("doi"),
-                    statistics=article_meta.get("statistics")
-                )
-            
-            paper_list.append(DocumentMetadata(
-                pk=paper.get("pk", "unknown"),
-                title=article_meta.get("title") if article_meta else None,
-                source_type=paper.get("source_type"),
-                source_url=paper.get("source_url"),
-                category=paper.get("category"),
-                tags=paper.get("tags", []),
-                total_chunks=paper.get("total_chunks", 0),
-                article_metadata=article_metadata_obj
-            ))
-        
-        return DocumentListResponse(
+        filter_values = await _get_filter_values_cached(repo)
+        headers = None
+        if filter_values:
+            etag = _weak_etag(
+                "paginated",
+                filter_values.get("version"),
+                page, page_size, category, source_type, after, count_mode, get_settings().FRONT_KEYSET_PAGINATION,
+            )
+            if _etag_matches(if_none_match, etag):
+                return _not_modified(etag)
+            headers = {"ETag": etag, "Cache-Control": FRONT_CACHE_CONTROL}
+        
+        paper_list, total, next_cursor = await _get_papers_page(
+            repo, skip=skip, limit=page_size, after=after, count_mode=count_mode, filters=filters
+        )
+        total_pages = (total + page_size - 1) // page_size if total is not None else None
+        
+        return _model_response(DocumentListResponse(
             total=total, 
             documents=paper_list,
             page=page,
             page_size=page_size,
-            total_pages=total_pages
-        )
+            total_pages=total_pages,
+            next_cursor=next_cursor
+        ), headers)
         
     except Exception as e:
         logger.error(f"❌ Error getting paginated documents: {e}")
@@ -259,46 +387,21 @@ async def get_documents_paginated(
 async def get_documents_by_category(
     category: str = Query(..., description="Categoría a filtrar"),
     skip: int = Query(0, ge=0),
-    limit: int = Query(20, ge=1, le=100)
+    limit: int = Query(20, ge=1, le=100),
+    after: Optional[str] = Query(None, description="Cursor keyset: next_cursor de la página anterior"),
+    count_mode: CountMode = Query("cached", description=COUNT_MODE_DESCRIPTION),
+    repo: MongoRepository = Depends(repo_dep)
 ):
-    """Búsqueda de documentos por categoría específica"""
+    """Búsqueda de documentos por categoría específica (paginación keyset con `?after=`)"""
     try:
-        logger.info(f"🏷️ Getting papers by category: {category}")
-        repo = get_mongo_repo()
+        logger.info(f"🏷️ Getting papers by category: {category}, after={after}")
         
         filters = {"metadata.category": category}
-        papers = repo.get_unique_papers(skip=skip, limit=limit, filters=filters)
-        total = repo.count_unique_papers(filters=filters)
-        
-        paper_list = []
-        for paper in papers:
-            # Extraer metadata
-            article_meta = paper.get("article_metadata", {})
-            
-            article_metadata_obj = None
-            if article_meta:
-                article_metadata_obj = ArticleMetadata(
-                    url=article_meta.get("url"),
-                    title=article_meta.get("title"),
-                    authors=article_meta.get("authors", []),
-                    scraped_at=article_meta.get("scraped_at"),
-                    pmc_id=article_meta.get("pmc_id"),
-                    doi=article_meta.get("doi"),
-                    statistics=article_meta.get("statistics")
-                )
-            
-            paper_list.append(DocumentMetadata(
-                pk=paper.get("pk", "unknown"),
-                title=article_meta.get("title") if article_meta else None,
-                source_type=paper.get("source_type"),
-                source_url=paper.get("source_url"),
-                category=paper.get("category"),
-                tags=paper.get("tags", []),
-                total_chunks=paper.get("total_chunks", 0),
-                article_metadata=article_metadata_obj
-            ))
-        
-        return DocumentListResponse(total=total, documents=paper_list)
+        paper_list, total, next_cursor = await _get_papers_page(
+            repo, skip=skip, limit=limit, after=after, count_mode=count_mode, filters=filters
+        )
+        
+        return _model_response(DocumentListResponse(total=total, documents=paper_list, next_cursor=next_cursor))
         
     except Exception as e:
         logger.error(f"❌ Error getting documents by category: {e}")
@@ -310,74 +413,65 @@ async def get_documents_by_tags(
     tags: List[str] = Query(..., description="Tags a filtrar"),
     match_all: bool = Query(False, description="Si true, debe coincidir con todos los tags"),
     skip: int = Query(0, ge=0),
-    limit: int = Query(20, ge=1, le=100)
+    limit: int = Query(20, ge=1, le=100),
+    after: Optional[str] = Query(None, description="Cursor keyset: next_cursor de la página anterior"),
+    count_mode: CountMode = Query("cached", description=COUNT_MODE_DESCRIPTION),
+    repo: MongoRepository = Depends(repo_dep)
 ):
-    """Búsqueda de documentos por tags"""
+    """Búsqueda de documentos por tags (paginación keyset con `?after=`)"""
     try:
-        logger.info(f"🏷️ Getting papers by tags: {tags}, match_all={match_all}")
-        repo = get_mongo_repo()
+        # Normalizar: sin vacíos ni duplicados (mismo orden)
+        tags = list(dict.fromkeys(tag.strip() for tag in tags if tag.strip()))
+        if not tags:
+            # $in: [] no matchea nada y $all: [] matchea todo: ninguno tiene sentido
+            raise HTTPException(status_code=400, detail="At least one non-empty tag is required")
         
-        if match_all:
+        logger.info(f"🏷️ Getting papers by tags: {tags}, match_all={match_all}, after={after}")
+        
+        if len(tags) == 1:
+            filters = {"metadata.tags": tags[0]}  # Igualdad directa sobre el índice multikey
+        elif match_all:
             filters = {"metadata.tags": {"$all": tags}}
         else:
             filters = {"metadata.tags": {"$in": tags}}
         
-        papers = repo.get_unique_papers(skip=skip, limit=limit, filters=filters)
-        total = repo.count_unique_papers(filters=filters)
-        
-        paper_list = []
-        for paper in papers:
-            # Extraer metadata
-            article_meta = paper.get("article_metadata", {})
-            
-            article_metadata_obj = None
-            if article_meta:
-                article_metadata_obj = ArticleMetadata(
-                    url=article_meta.get("url"),
-                    title=article_meta.get("title"),
-                    authors=article_meta.get("authors", []),
-                    scraped_at=article_meta.get("scraped_at"),
-                    pmc_id=article_meta.get("pmc_id"),
-                    doi=article_meta.get("doi"),
-                    statistics=article_meta.get("statistics")
-                )
-            
-            paper_list.append(DocumentMetadata(
-                pk=paper.get("pk", "unknown"),
-                title=article_meta.get("title") if article_meta else None,
-                source_type=paper.get("source_type"),
-                source_url=paper.get("source_url"),
-                category=paper.get("category"),
-                tags=paper.get("tags", []),
-                total_chunks=paper.get("total_chunks", 0),
-                article_metadata=article_metadata_obj
-            ))
-        
-        return DocumentListResponse(total=total, documents=paper_list)
+        paper_list, total, next_cursor = await _get_papers_page(
+            repo, skip=skip, limit=limit, after=after, count_mode=count_mode, filters=filters
+        )
+        
+        return _model_response(DocumentListResponse(total=total, documents=paper_list, next_cursor=next_cursor))
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"❌ Error getting documents by tags: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/filter-values", response_model=FilterValuesResponse)
-async def get_available_filter_values():
-    """Obtener valores disponibles para filtros dinámicos"""
+async def get_available_filter_values(
+    if_none_match: Optional[str] = Header(None),
+    repo: MongoRepository = Depends(repo_dep)
+):
+    """Obtener valores disponibles para filtros dinámicos (soporta `If-None-Match`)"""
     try:
         logger.info("📊 Getting available filter values")
-        repo = get_mongo_repo()
-        filter_values = repo.get_filter_values()
-        
-        return FilterValuesResponse(
-            categories=filter_values.get("categories", [
-                "general", "mission", "nasa", "physics", "planets", 
-                "science", "space", "technology"
-            ]),
+        filter_values = await _get_filter_values_cached(repo)
+        
+        headers = None
+        if filter_values:
+            etag = _weak_etag("filter-values", filter_values.get("version") or filter_values)
+            if _etag_matches(if_none_match, etag):
+                return _not_modified(etag)
+            headers = {"ETag": etag, "Cache-Control": FRONT_CACHE_CONTROL}
+        
+        return _model_response(FilterValuesResponse(
+            categories=filter_values.get("categories") or DEFAULT_CATEGORIES,
             tags=filter_values.get("tags", []),
-            source_types=filter_values.get("source_types", ["article"]),
+            source_types=filter_values.get("source_types") or DEFAULT_SOURCE_TYPES,
             total_documents=filter_values.get("total_documents", 536),
             total_chunks=filter_values.get("total_chunks", 22674)
-        )
+        ), headers)
         
     except Exception as e:
         logger.error(f"❌ Error getting filter values: {e}")
@@ -385,11 +479,17 @@ async def get_available_filter_values():
 
 
 @router.get("/documents/{pk}", response_model=DocumentDetailResponse)
-async def get_document_detail(pk: str):
+async def get_document_detail(
+    pk: str,
+    chunk_limit: int = Query(20, ge=1, le=100, description="Chunks a incluir (primera página)"),
+    repo: MongoRepository = Depends(repo_dep)
+):
     """
-    📖 **Obtener detalle completo de un documento**
+    📖 **Obtener detalle de un documento**
     
-    Retorna todos los chunks de un documento específico con metadata completa.
+    Retorna la metadata completa del documento y la primera página de sus chunks
+    (`chunk_limit`, 20 por defecto). `total_chunks` indica cuántos hay en total;
+    el resto se pide bajo demanda con `GET /documents/{pk}/chunks?skip=&limit=`.
     
     **Ejemplo:**
     ```
@@ -421,75 +521,24 @@ async def get_document_detail(pk: str):
     try:
         logger.info(f"📖 Getting document detail: pk={pk}")
         
-        repo = get_mongo_repo()
-        document = repo.get_document_by_id(pk)
+        if pk in RESERVED_DOCUMENT_PATHS:
+            # Método equivocado sobre una subruta estática: 404 sin consultar MongoDB
+            raise HTTPException(status_code=404, detail=f"Document {pk} not found")
+        
+        document = await repo.get_document_by_id(pk, chunk_limit=chunk_limit)
         
         if not document:
             raise HTTPException(status_code=404, detail=f"Document {pk} not found")
         
-        # Convertir metadata
-        meta = document["metadata"]
-        article_meta = meta.get("article_metadata")
-        article_metadata_obj = None
-        if article_meta:
-            article_metadata_obj = ArticleMetadata(
-                url=article_meta.get("url"),
-                title=article_meta.get("title", ""),
-                authors=article_meta.get("authors", []),
-                scraped_at=article_meta.get("scraped_at"),
-                pmc_id=article_meta.get("pmc_id"),
-                doi=article_meta.get("doi"),
-                statistics=article_meta.get("statistics")
-            )
-        
-        metadata_obj = DocumentMetadata(
-            pk=meta.get("pk", ""),
-            title=meta.get("title", ""),
-            source_type=meta.get("source_type"),
-            source_url=meta.get("source_url"),
-            category=meta.get("category"),
-            tags=meta.get("tags", []),
-            total_chunks=meta.get("total_chunks", 0),
-            article_metadata=article_metadata_obj
-        )
+        # Los chunks comparten la instancia de article_metadata de la metadata
+        metadata_obj = build_meta(document["metadata"])
+        chunks_list = build_chunks(document["chunks"], article_metadata=metadata_obj.article_metadata)
         
-        # Convertir chunks
-        chunks_list = []
-        for chunk in document["chunks"]:
-            chunk_meta = chunk.get("metadata", {})
-            chunk_article_meta = chunk_meta.get("article_metadata")
-            chunk_article_metadata_obj = None
-            if chunk_article_meta:
-                chunk_article_metadata_obj = ArticleMetadata(
-                    url=chunk_article_meta.get("url"),
-                    title=chunk_article_meta.get("title", ""),
-                    authors=chunk_article_meta.get("authors", []),
-                    scraped_at=chunk_article_meta.get("scraped_at"),
-                    pmc_id=chunk_article_meta.get("pmc_id"),
-                    doi=chunk_article_meta.get("doi"),
-                    statistics=chunk_article_meta.get("statistics")
-                )
-            
-            chunks_list.append(DocumentChunk(
-                pk=chunk.get("pk", ""),
-                text=chunk.get("text", ""),
-                source_type=chunk.get("source_type"),
-                source_url=chunk.get("source_url"),
-                category=chunk_meta.get("category"),
-                tags=chunk_meta.get("tags", []),
-                chunk_index=chunk.get("chunk_index", 0),
-                total_chunks=chunk.get("total_chunks", 0),
-                char_count=chunk_meta.get("char_count"),
-                word_count=chunk_meta.get("word_count"),
-                sentences_count=chunk_meta.get("sentences_count"),
-                article_metadata=chunk_article_metadata_obj
-            ))
-        
-        return DocumentDetailResponse(
+        return _model_response(DocumentDetailResponse(
             metadata=metadata_obj,
             chunks=chunks_list,
             total_chunks=document["total_chunks"]
-        )
+        ))
         
     except HTTPException:
         raise
@@ -498,13 +547,100 @@ async def get_document_detail(pk: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/documents/{pk}/chunks", response_model=ChunksListResponse)
+async def get_document_chunks(
+    pk: str,
+    skip: int = Query(0, ge=0, description="Chunks a saltar"),
+    limit: int = Query(20, ge=1, le=100, description="Chunks por página"),
+    repo: MongoRepository = Depends(repo_dep)
+):
+    """
+    📑 **Paginar los chunks de un documento**
+    
+    Chunks ordenados por `chunk_index`, para cargar bajo demanda el resto del
+    documento después de `GET /documents/{pk}`.
+    
+    **Ejemplo:**
+    ```
+    GET /api/front/documents/mice-in-bion-m-1-space-mission/chunks?skip=20&limit=20
+    ```
+    """
+    try:
+        logger.info(f"📑 Getting document chunks: pk={pk}, skip={skip}, limit={limit}")
+        
+        chunks, total = await repo.get_document_chunks(pk, skip=skip, limit=limit)
+        
+        if not total:
+            raise HTTPException(status_code=404, detail=f"Document {pk} not found")
+        
+        return _model_response(ChunksListResponse(
+            total=total,
+            chunks=build_chunks(chunks)
+        ))
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"❌ Error getting document chunks: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/documents/{pk}/stream")
+async def stream_document(pk: str, repo: MongoRepository = Depends(repo_dep)):
+    """
+    🌊 **Documento completo en streaming (NDJSON)**
+    
+    Alternativa a `GET /documents/{pk}` para documentos grandes: no arma la
+    respuesta entera en memoria. La primera línea es la cabecera
+    `{"metadata": {...}, "total_chunks": N}`; después, un chunk por línea en
+    orden de `chunk_index` (sin `article_metadata`, que ya va en la cabecera).
+    Si MongoDB falla a mitad del stream, la última línea es `{"error": "..."}`.
+    
+    **Ejemplo:**
+    ```
+    GET /api/front/documents/mice-in-bion-m-1-space-mission/stream
+    ```
+    """
+    logger.info(f"🌊 Streaming document: pk={pk}")
+    
+    if pk in RESERVED_DOCUMENT_PATHS:
+        raise HTTPException(status_code=404, detail=f"Document {pk} not found")
+    
+    # Metadata + total antes de empezar el stream: el 404 todavía puede ser un status HTTP
+    document = await repo.get_document_by_id(pk, chunk_limit=0)
+    if not document:
+        raise HTTPException(status_code=404, detail=f"Document {pk} not found")
+    
+    header = {
+        "metadata": build_meta(document["metadata"]).model_dump(exclude_none=True),
+        "total_chunks": document["total_chunks"],
+    }
+    
+    async def ndjson_lines() -> AsyncIterator[bytes]:
+        yield orjson.dumps(header) + b"\n"
+        # Los chunks ya vienen con las claves de DocumentChunk (CHUNK_BODY_PROJECTION)
+        try:
+            async for chunk in repo.iter_document_chunks(pk):
+                yield orjson.dumps(chunk) + b"\n"
+        except Exception as e:
+            # El status 200 ya se envió: la última línea marca el stream como incompleto
+            logger.error(f"❌ Error streaming document {pk}: {e}")
+            yield orjson.dumps({"error": str(e)}) + b"\n"
+    
+    return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson")
+
+
 @router.get("/filters", response_model=FilterValuesResponse)
-async def get_filter_values():
+async def get_filter_values(
+    if_none_match: Optional[str] = Header(None),
+    repo: MongoRepository = Depends(repo_dep)
+):
     """
     🎯 **Obtener valores disponibles para filtros**
     
     Retorna todos los valores únicos para cada filtro disponible.
     Útil para poblar dropdowns y selectores en el frontend.
+    Soporta `If-None-Match` (responde `304` si los valores no cambiaron).
     
     **Ejemplo:**
     ```
@@ -525,16 +661,22 @@ async def get_filter_values():
     try:
         logger.info("🎯 Getting filter values")
         
-        repo = get_mongo_repo()
-        filter_values = repo.get_filter_values()
+        filter_values = await _get_filter_values_cached(repo)
         
-        return FilterValuesResponse(
+        headers = None
+        if filter_values:
+            etag = _weak_etag("filters", filter_values.get("version") or filter_values)
+            if _etag_matches(if_none_match, etag):
+                return _not_modified(etag)
+            headers = {"ETag": etag, "Cache-Control": FRONT_CACHE_CONTROL}
+        
+        return _model_response(FilterValuesResponse(
             categories=filter_values.get("categories", []),
             tags=filter_values.get("tags", []),
             source_types=filter_values.get("source_types", []),
             total_documents=filter_values.get("total_documents", 0),
             total_chunks=filter_values.get("total_chunks", 0)
-        )
+        ), headers)
         
     except Exception as e:
         logger.error(f"❌ Error getting filter values: {e}")
@@ -542,11 +684,15 @@ async def get_filter_values():
 
 
 @router.get("/stats")
-async def get_statistics():
+async def get_statistics(
+    if_none_match: Optional[str] = Header(None),
+    repo: MongoRepository = Depends(repo_dep)
+):
     """
     📊 **Obtener estadísticas de la base de datos**
     
     Retorna estadísticas generales de la colección.
+    Soporta `If-None-Match` (responde `304` si no cambiaron).
     
     **Ejemplo:**
     ```
@@ -567,10 +713,13 @@ async def get_statistics():
     try:
         logger.info("📊 Getting database statistics")
         
-        repo = get_mongo_repo()
-        filter_values = repo.get_filter_values()
+        stats = await cache_get_json(STATS_CACHE_KEY)
+        if stats is not None:
+            return _stats_response(stats, if_none_match)
+        
+        filter_values = await _get_filter_values_cached(repo)
         
-        return {
+        stats = {
             "total_documents": filter_values.get("total_documents", 0),
             "total_chunks": filter_values.get("total_chunks", 0),
             "categories_count": len(filter_values.get("categories", [])),
@@ -578,7 +727,28 @@ async def get_statistics():
             "source_types": filter_values.get("source_types", []),
             "categories": filter_values.get("categories", [])
         }
+        if not filter_values:
+            return stats  # Error de MongoDB: sin cache ni ETag
+        await cache_set_json(STATS_CACHE_KEY, stats, get_settings().FRONT_CACHE_TTL)
+        return _stats_response(stats, if_none_match)
         
     except Exception as e:
         logger.error(f"❌ Error getting statistics: {e}")
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/cache/invalidate", dependencies=[Depends(admin_key_dep)])
+async def invalidate_cache(repo: MongoRepository = Depends(repo_dep)):
+    """
+    🧹 **Invalidar el cache de /filters y /stats**
+    
+    Llamar desde el ETL después de cada ingesta: recalcula la vista materializada
+    de valores de filtros (`front_filter_values`) y borra el cache, para que los
+    nuevos documentos aparezcan sin esperar al TTL (`FRONT_CACHE_TTL`).
+    Requiere el header `X-Admin-Key` (`ADMIN_API_KEY`); llamadas concurrentes
+    comparten un mismo recálculo.
+    """
+    filter_values = await repo.refresh_filter_values(force=True)
+    deleted = await cache_delete(FILTERS_CACHE_KEY, STATS_CACHE_KEY)
+    logger.info(f"🧹 Front cache invalidated ({deleted} keys)")
+    return {"invalidated": deleted, "filter_values_refreshed": bool(filter_values)}
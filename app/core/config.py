@@ -1,4 +1,5 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
+from functools import cached_property, lru_cache
 import os
 from urllib.parse import urlparse, urlunparse, parse_qs, urlencode
 
@@ -14,6 +15,7 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int
 
     @staticmethod
+    @lru_cache(maxsize=4)
     def _normalize_db_url(raw: str) -> str:
         if not raw:
             return raw
@@ -34,8 +36,9 @@ class Settings(BaseSettings):
 
         return urlunparse((scheme, p.netloc, p.path, p.params, query, p.fragment))
 
-    @property
+    @cached_property
     def DATABASE_URL(self) -> str:
+        # Se calcula una sola vez: el entorno no cambia con la app corriendo
         raw = os.getenv("DATABASE_URL")
         if raw:
             return self._normalize_db_url(raw)
@@ -4,50 +4,74 @@ CORS y rate limiting simple (opcional).
 """
 from fastapi import Request, HTTPException, status
 from fastapi.middleware.cors import CORSMiddleware
-from collections import defaultdict
-from datetime import datetime, timedelta
-from app.core.settings import settings
+from collections import OrderedDict, deque
+from time import monotonic
+from app.core.settings import get_settings
 
 
 # === Rate Limiter Simple (en memoria) ===
 class SimpleRateLimiter:
-    """Rate limiter simple basado en IP"""
+    """
+    Rate limiter simple basado en IP (ventana deslizante).
+    Por IP guarda una deque de timestamps monotonic: los vencidos se sacan por
+    la izquierda (O(1) amortizado) en vez de reconstruir la lista en cada request.
+    Las IPs se guardan en orden LRU y se acotan a `max_clients`: las inactivas
+    se descartan en vez de acumularse mientras el proceso vive.
+    """
     
-    def __init__(self, max_requests: int = 30, window_seconds: int = 60):
+    def __init__(self, max_requests: int = 30, window_seconds: int = 60, max_clients: int = 10_000):
         self.max_requests = max_requests
-        self.window = timedelta(seconds=window_seconds)
-        self.requests = defaultdict(list)
+        self.window_seconds = window_seconds
+        self.max_clients = max_clients
+        self.requests: "OrderedDict[str, deque]" = OrderedDict()
     
     def check(self, client_ip: str) -> bool:
         """Check if client can make request"""
-        now = datetime.utcnow()
+        now = monotonic()
+        cutoff = now - self.window_seconds
+        
+        timestamps = self.requests.get(client_ip)
+        if timestamps is None:
+            timestamps = self.requests[client_ip] = deque()
+            if len(self.requests) > self.max_clients:
+                self.requests.popitem(last=False)  # IP usada hace más tiempo
+        else:
+            self.requests.move_to_end(client_ip)
+        
         # Limpiar requests antiguos
-        self.requests[client_ip] = [
-            req_time for req_time in self.requests[client_ip]
-            if now - req_time < self.window
-        ]
+        while timestamps and timestamps[0] <= cutoff:
+            timestamps.popleft()
         
-        if len(self.requests[client_ip]) >= self.max_requests:
+        if len(timestamps) >= self.max_requests:
             return False
         
-        self.requests[client_ip].append(now)
+        timestamps.append(now)
         return True
 
 
-rate_limiter = SimpleRateLimiter(
-    max_requests=settings.RATE_LIMIT_REQUESTS,
-    window_seconds=settings.RATE_LIMIT_WINDOW
-)
+# Singleton: se crea con el primer request (no al importar, así no fuerza get_settings())
+_rate_limiter = None
+
+def get_rate_limiter() -> SimpleRateLimiter:
+    """Get or create rate limiter"""
+    global _rate_limiter
+    if _rate_limiter is None:
+        settings = get_settings()
+        _rate_limiter = SimpleRateLimiter(
+            max_requests=settings.RATE_LIMIT_REQUESTS,
+            window_seconds=settings.RATE_LIMIT_WINDOW
+        )
+    return _rate_limiter
 
 
 async def rate_limit_middleware(request: Request, call_next):
     """Middleware de rate limiting"""
-    if not settings.RATE_LIMIT_ENABLED:
+    if not get_settings().RATE_LIMIT_ENABLED:
         return await call_next(request)
     
     client_ip = request.client.host if request.client else "unknown"
     
-    if not rate_limiter.check(client_ip):
+    if not get_rate_limiter().check(client_ip):
         raise HTTPException(
             status_code=status.HTTP_429_TOO_MANY_REQUESTS,
             detail="Too many requests. Please try again later."
@@ -59,7 +83,7 @@ async def rate_limit_middleware(request: Request, call_next):
 def setup_cors(app):
     """Setup CORS middleware"""
     # Verificar si CORS está configurado para permitir todos los orígenes
-    if settings.CORS_ORIGINS.strip(' "') == "*":
+    if get_settings().CORS_ORIGINS.strip(' "') == "*":
         # Permitir todos los orígenes
         app.add_middleware(
             CORSMiddleware,
@@ -72,7 +96,7 @@ def setup_cors(app):
         # Usar orígenes específicos
         app.add_middleware(
             CORSMiddleware,
-            allow_origins=settings.cors_origins_list,
+            allow_origins=get_settings().cors_origins_list,
             allow_credentials=True,
             allow_methods=["*"],
             allow_headers=["*"],
@@ -2,8 +2,9 @@
 NASA Biology RAG - Settings
 Configuración centralizada para el servicio RAG de biología espacial.
 """
+from functools import cached_property
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from typing import Literal
+from typing import Literal, Optional
 
 
 class Settings(BaseSettings):
@@ -31,6 +32,17 @@ class Settings(BaseSettings):
     MONGODB_DB: str = "nasa_bio"
     MONGODB_COLLECTION: str = "pub_chunks"
     MONGODB_VECTOR_INDEX: str = "vector_index"  # nombre del índice vectorial
+    MONGODB_ENSURE_INDEXES: bool = True  # crear índices del frontend al arrancar
+    # Filtros dentro de $vectorSearch (pre-filtro del ANN). Requiere declarar organism, mission_env,
+    # system, exposure, assay, tissue, metadata.tags y year como campos "filter" del índice vectorial
+    MONGODB_VECTOR_PREFILTER: bool = False
+    
+    # Pool del cliente async (Motor, endpoints del frontend)
+    MONGODB_MAX_POOL_SIZE: int = 100
+    MONGODB_MIN_POOL_SIZE: int = 10
+    MONGODB_WAIT_QUEUE_TIMEOUT_MS: int = 5000  # espera máxima por una conexión libre
+    # Compresión del protocolo (ej: "zstd,zlib"; zstd requiere el paquete `zstandard`). Vacío = sin comprimir
+    MONGODB_COMPRESSORS: str = ""
     
     # MongoDB Connection Details (opcionales para debugging)
     MONGO_USER: str = "admin"
@@ -56,12 +68,31 @@ class Settings(BaseSettings):
     MAX_TOP_K: int = 20
     MIN_SIMILARITY: float = 0.70
     ENABLE_RERANK: bool = False  # re-rank con LLM (opcional)
+    FACET_COUNTS_CACHE_TTL: int = 300  # segundos, cache en memoria de facet_counts (0 = sin cache)
+    
+    # === Semantic Cache (LSH sobre embeddings de query) ===
+    SEMANTIC_CACHE_ENABLED: bool = True
+    SEMANTIC_CACHE_THRESHOLD: float = 0.95  # similitud coseno mínima para hit
+    SEMANTIC_CACHE_TTL: int = 600  # segundos
+    SEMANTIC_CACHE_MAX_ENTRIES: int = 1024
+    
+    # === Frontend API ===
+    FRONT_KEYSET_PAGINATION: bool = True  # ?after=<pk> + next_cursor; False = orden legacy (skip/limit)
+    FRONT_CACHE_TTL: int = 300  # segundos, cache de /filters y /stats
+    FRONT_COUNT_CACHE_TTL: int = 30  # segundos, cache de totales filtrados de los listados
+    FRONT_FILTERS_REFRESH_INTERVAL: int = 300  # segundos, recálculo de front_filter_values en background (0 = solo on-demand)
+    
+    # === Redis (opcional, cache compartido entre workers) ===
+    REDIS_URL: Optional[str] = None  # ej: redis://localhost:6379/0
     
     # === Rate Limiting (opcional) ===
     RATE_LIMIT_ENABLED: bool = False
     RATE_LIMIT_REQUESTS: int = 30
     RATE_LIMIT_WINDOW: int = 60  # segundos
     
+    # === Admin (endpoints de mantenimiento, ej: POST /api/front/cache/invalidate) ===
+    ADMIN_API_KEY: Optional[str] = None  # header X-Admin-Key; sin configurar, esos endpoints responden 403
+    
     # === CORS ===
     CORS_ORIGINS: str = "http://localhost:3000,http://localhost:8000"
     
@@ -76,15 +107,24 @@ class Settings(BaseSettings):
         extra="ignore"  # Ignorar campos extra en .env
     )
     
-    @property
+    # cached_property: los settings no cambian después de construirse, se parsean una vez
+    @cached_property
     def allowed_sources_list(self) -> list[str]:
         """Parse allowed sources"""
         return [s.strip().upper() for s in self.NASA_ALLOWED_SOURCES.split(",") if s.strip()]
     
-    @property
+    @cached_property
     def cors_origins_list(self) -> list[str]:
         """Parse CORS origins"""
         return [o.strip().rstrip("/") for o in self.CORS_ORIGINS.split(",") if o.strip()]
 
 
-settings = Settings()
+# Singleton: se construye (lee .env y valida) en el primer acceso, no al importar el módulo
+_settings: Optional[Settings] = None
+
+def get_settings() -> Settings:
+    """Get or create settings"""
+    global _settings
+    if _settings is None:
+        _settings = Settings()
+    return _settings
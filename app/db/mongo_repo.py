@@ -2,14 +2,303 @@
 NASA Biology RAG - MongoDB Repository (Opción A - PROD)
 Repositorio para MongoDB con vector search (Atlas Vector Search).
 """
-from typing import List, Dict, Any, Optional
-from pymongo import MongoClient
-from pymongo.errors import PyMongoError, ServerSelectionTimeoutError
-from app.core.settings import settings
+from typing import AsyncIterator, List, Dict, Any, Optional, Tuple
+from pymongo import MongoClient, ASCENDING, TEXT, monitoring
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo.errors import DuplicateKeyError, PyMongoError, ServerSelectionTimeoutError
+from bson import ObjectId
+from app.core.settings import get_settings
+from datetime import datetime, timedelta, timezone
+from time import monotonic
+import asyncio
+import hashlib
 import logging
+import orjson
+import re
 
 logger = logging.getLogger(__name__)
 
+# Índices de los endpoints del frontend: filtros facetados, paginación keyset por pk
+# y búsqueda de texto ($text). Cada chunk comparte pk con su paper (pk no es único).
+# source_id: lookup de chunks por id del RAG (get_by_ids, $in).
+FRONT_INDEXES = [
+    ([("pk", ASCENDING), ("chunk_index", ASCENDING)], {}),
+    ([("source_id", ASCENDING)], {}),
+    ([("metadata.category", ASCENDING), ("pk", ASCENDING)], {}),
+    ([("metadata.tags", ASCENDING), ("pk", ASCENDING)], {}),
+    ([("source_type", ASCENDING), ("pk", ASCENDING)], {}),
+    ([("metadata.article_metadata.pmc_id", ASCENDING)], {}),
+    (
+        [("metadata.article_metadata.title", TEXT), ("text", TEXT), ("metadata.tags", TEXT)],
+        {"name": "front_text_search", "weights": {"metadata.article_metadata.title": 5, "metadata.tags": 3}},
+    ),
+]
+
+# Índice a forzar (hint) según los campos del $match de un listado, cuando hay un solo
+# filtro además del cursor pk: el planner a veces elige metadata.tags o un COLLSCAN
+FRONT_HINTS = {
+    frozenset(): [("pk", ASCENDING), ("chunk_index", ASCENDING)],  # solo cursor keyset
+    frozenset({"metadata.category"}): [("metadata.category", ASCENDING), ("pk", ASCENDING)],
+    frozenset({"source_type"}): [("source_type", ASCENDING), ("pk", ASCENDING)],
+    frozenset({"metadata.tags"}): [("metadata.tags", ASCENDING), ("pk", ASCENDING)],
+}
+
+
+def _index_key_patterns(indexes: List[Dict[str, Any]]) -> frozenset:
+    """Patrones de clave de los índices existentes, ej: (("pk", 1), ("chunk_index", 1))"""
+    return frozenset(
+        tuple((field, int(direction) if isinstance(direction, (int, float)) else direction)
+              for field, direction in index["key"].items())
+        for index in indexes
+    )
+
+
+# Filtros facetados de search_vectors que se aplican como {campo: {"$in": valores}}
+VECTOR_FILTER_FIELDS = ("organism", "mission_env", "system", "exposure", "assay", "tissue")
+
+# Campos de cada chunk que devuelve search_vectors (+ score del índice vectorial)
+VECTOR_SEARCH_PROJECTION = {
+    "$project": {
+        "_id": 1,  # Include MongoDB _id
+        "source_id": 1,
+        "title": 1,
+        "text": 1,  # search_vectors(text_limit=N) lo reemplaza por $substrCP
+        "abstract": 1,  # Include abstract
+        "publication_year": 1,  # Include publication_year
+        "section": 1,
+        "doi": 1,
+        "osdr_id": 1,
+        "organism": 1,
+        "system": 1,
+        "mission_env": 1,
+        "exposure": 1,
+        "assay": 1,
+        "tissue": 1,
+        "year": 1,  # Keep for backwards compatibility
+        "venue": 1,
+        "url": 1,
+        "source_url": 1,  # Include source_url
+        "source_type": 1,
+        "chunk_index": 1,
+        "total_chunks": 1,
+        "created_at": 1,
+        "metadata": 1,  # Include complete metadata object
+        # Get the vector search score
+        "similarity": {"$meta": "vectorSearchScore"}
+    }
+}
+
+# Campos de ArticleMetadata (schemas/front.py): el resto de metadata.article_metadata
+# (ej: textos largos del scraper) no se lee de disco ni viaja por la red
+ARTICLE_METADATA_FIELDS = ("url", "title", "authors", "scraped_at", "pmc_id", "doi", "statistics")
+
+# Expresión $project que arma article_metadata solo con esos campos
+ARTICLE_METADATA_EXPR = {field: f"$metadata.article_metadata.{field}" for field in ARTICLE_METADATA_FIELDS}
+
+# Campos de cada chunk que necesita la agrupación por paper (deja fuera text y embedding)
+PAPER_SOURCE_PROJECTION = {
+    "$project": {
+        "pk": 1,
+        "source_type": 1,
+        "source_url": 1,
+        "metadata.category": 1,
+        "metadata.tags": 1,
+        **{f"metadata.article_metadata.{field}": 1 for field in ARTICLE_METADATA_FIELDS}
+    }
+}
+
+# Agrupación chunk -> paper (1 resultado por pk) usada por los listados del frontend
+UNIQUE_PAPER_GROUP = {
+    "$group": {
+        "_id": "$pk",  # Agrupar por pk
+        "pk": {"$first": "$pk"},
+        "source_type": {"$first": "$source_type"},
+        "source_url": {"$first": "$source_url"},
+        "category": {"$first": "$metadata.category"},
+        "tags": {"$first": "$metadata.tags"},
+        "article_metadata": {"$first": "$metadata.article_metadata"},
+        "total_chunks": {"$sum": 1},  # Contar chunks
+        "first_chunk_id": {"$first": "$_id"}  # ID del primer chunk
+    }
+}
+
+# Igual que UNIQUE_PAPER_GROUP + score de relevancia (búsquedas con $text)
+TEXT_SCORED_PAPER_GROUP = {
+    "$group": {**UNIQUE_PAPER_GROUP["$group"], "score": {"$max": {"$meta": "textScore"}}}
+}
+
+# Campos de DocumentMetadata (schemas/front.py), con las mismas claves que el schema
+PAPER_LIST_PROJECTION = {
+    "_id": 0,
+    "pk": 1,
+    "title": "$article_metadata.title",
+    "source_type": 1,
+    "source_url": 1,
+    "category": 1,
+    "tags": 1,
+    "total_chunks": 1,
+    "article_metadata": 1
+}
+
+# Campos de DocumentMetadata leídos del primer chunk de un documento (detalle):
+# MongoDB arma el dict con las claves del schema, sin copiarlas en Python por request
+DOCUMENT_META_PROJECTION = {
+    "$project": {
+        "_id": 0,
+        "pk": 1,
+        "title": "$metadata.article_metadata.title",
+        "source_type": 1,
+        "source_url": 1,
+        "category": "$metadata.category",
+        "tags": "$metadata.tags",
+        "article_metadata": ARTICLE_METADATA_EXPR
+    }
+}
+
+# Campos de DocumentChunk (schemas/front.py), aplanados desde metadata.* y sin embedding.
+# _id se expone como DocumentChunk.id (string). Proyección con expresiones: MongoDB >= 4.4
+CHUNK_DETAIL_PROJECTION = {
+    "_id": 0,
+    "id": {"$toString": "$_id"},
+    "pk": 1,
+    "text": 1,
+    "source_type": 1,
+    "source_url": 1,
+    "chunk_index": 1,
+    "total_chunks": 1,
+    "category": "$metadata.category",
+    "tags": "$metadata.tags",
+    "char_count": "$metadata.char_count",
+    "word_count": "$metadata.word_count",
+    "sentences_count": "$metadata.sentences_count",
+    "article_metadata": ARTICLE_METADATA_EXPR
+}
+
+# Igual que CHUNK_DETAIL_PROJECTION pero sin article_metadata: en el detalle es la misma
+# para todos los chunks del documento y ya viene en la metadata
+CHUNK_BODY_PROJECTION = {k: v for k, v in CHUNK_DETAIL_PROJECTION.items() if k != "article_metadata"}
+
+# Agrupación legacy chunk -> documento por DOI (get_all_documents)
+LEGACY_DOCUMENT_GROUP = {
+    "$group": {
+        "_id": "$doi",  # Agrupar por DOI para evitar duplicados
+        "source_id": {"$first": "$source_id"},
+        "title": {"$first": "$title"},
+        "year": {"$first": "$year"},
+        "doi": {"$first": "$doi"},
+        "osdr_id": {"$first": "$osdr_id"},
+        "organism": {"$first": "$organism"},
+        "mission_env": {"$first": "$mission_env"},
+        "exposure": {"$first": "$exposure"},
+        "system": {"$first": "$system"},
+        "tissue": {"$first": "$tissue"},
+        "assay": {"$first": "$assay"},
+        "chunk_count": {"$sum": 1},
+        "text_preview": {"$first": "$text"},  # Preview del primer chunk
+        # Nuevos campos para frontend
+        "pk": {"$first": "$pk"},
+        "source_type": {"$first": "$source_type"},
+        "source_url": {"$first": "$source_url"},
+        "category": {"$first": "$metadata.category"},
+        "tags": {"$first": "$metadata.tags"},
+        "article_metadata": {"$first": "$metadata.article_metadata"},
+        "total_chunks": {"$sum": 1}
+    }
+}
+
+LEGACY_DOCUMENT_PROJECTION = {
+    "$project": {
+        "_id": 0,
+        "pk": 1,
+        "title": 1,
+        "source_type": 1,
+        "source_url": 1,
+        "category": 1,
+        "tags": 1,
+        "total_chunks": 1,
+        "article_metadata": 1,
+        # Campos legacy para compatibilidad
+        "source_id": 1,
+        "year": 1,
+        "doi": 1,
+        "osdr_id": 1,
+        "organism": 1,
+        "mission_env": 1,
+        "exposure": 1,
+        "system": 1,
+        "tissue": 1,
+        "assay": 1,
+        "chunk_count": 1,
+        "text_preview": {"$substr": ["$text_preview", 0, 200]}  # Primeros 200 chars
+    }
+}
+
+# Chunks por paper estimados al dimensionar la ventana de la fase 1 del keyset
+# (ventana = (skip + limit) * esto; si no alcanza se leen más ventanas)
+KEYSET_CHUNKS_PER_PAPER = 64
+
+# Chunks por batch al recorrer un documento entero (cursor incremental, memoria acotada)
+CHUNK_CURSOR_BATCH_SIZE = 50
+
+# Vista materializada de /filters y /stats: un solo documento, recalculado tras cada ingesta
+FILTER_VALUES_COLLECTION = "front_filter_values"
+FILTER_VALUES_DOC_ID = "v"
+# Lease del recálculo periódico (mismo collection): un solo worker recalcula por intervalo
+FILTER_VALUES_LEASE_ID = "refresh_lease"
+
+
+class PoolStatsListener(monitoring.ConnectionPoolListener):
+    """
+    Contadores del pool de conexiones de un cliente (expuestos en /diag/health).
+    Aproximados: los eventos llegan desde varios threads sin lock.
+    """
+    
+    def __init__(self):
+        self.open = 0
+        self.checked_out = 0
+        self.checkout_timeouts = 0
+    
+    def stats(self) -> Dict[str, int]:
+        return {
+            "open": self.open,
+            "checked_out": self.checked_out,
+            "checkout_timeouts": self.checkout_timeouts,
+        }
+    
+    def connection_created(self, event):
+        self.open += 1
+    
+    def connection_closed(self, event):
+        self.open -= 1
+    
+    def connection_checked_out(self, event):
+        self.checked_out += 1
+    
+    def connection_checked_in(self, event):
+        self.checked_out -= 1
+    
+    def connection_check_out_failed(self, event):
+        if event.reason == monitoring.ConnectionCheckOutFailedReason.TIMEOUT:
+            self.checkout_timeouts += 1
+    
+    def pool_created(self, event):
+        pass
+    
+    def pool_ready(self, event):
+        pass
+    
+    def pool_cleared(self, event):
+        pass
+    
+    def pool_closed(self, event):
+        pass
+    
+    def connection_ready(self, event):
+        pass
+    
+    def connection_check_out_started(self, event):
+        pass
+
 
 class MongoRepository:
     """Repositorio para MongoDB con Atlas Vector Search"""
@@ -20,6 +309,7 @@ class MongoRepository:
         Similar a ETL-service para mejor compatibilidad
         """
         # Detectar si es mongodb+srv:// o mongodb://
+        settings = get_settings()
         is_srv = settings.MONGODB_URI.startswith('mongodb+srv://')
         
         # Configuración base (común para ambos)
@@ -34,6 +324,10 @@ class MongoRepository:
             'w': 'majority',
         }
         
+        # Comprimir el tráfico (chunks de texto, páginas de papers) con el servidor
+        if settings.MONGODB_COMPRESSORS:
+            client_options['compressors'] = settings.MONGODB_COMPRESSORS
+        
         # Configuración específica para mongodb+srv:// (Atlas)
         if is_srv:
             client_options.update({
@@ -54,6 +348,35 @@ class MongoRepository:
             self.database = self.client[settings.MONGODB_DB]
             self.collection = self.database[settings.MONGODB_COLLECTION]
             
+            # Cliente async (Motor) para los endpoints del frontend: no bloquea el
+            # event loop. El pool de conexiones se comparte entre todos los requests;
+            # su tamaño se ajusta por settings según la concurrencia esperada.
+            self.async_pool_stats = PoolStatsListener()
+            self.async_client = AsyncIOMotorClient(
+                settings.MONGODB_URI,
+                **{
+                    **client_options,
+                    'maxPoolSize': settings.MONGODB_MAX_POOL_SIZE,
+                    'minPoolSize': settings.MONGODB_MIN_POOL_SIZE,
+                    'waitQueueTimeoutMS': settings.MONGODB_WAIT_QUEUE_TIMEOUT_MS,
+                    'event_listeners': [self.async_pool_stats],
+                },
+            )
+            self.async_database = self.async_client[settings.MONGODB_DB]
+            self.async_collection = self.async_database[settings.MONGODB_COLLECTION]
+            
+            # Cache de facet_counts: (expires_at monotonic, resultado)
+            self._facet_counts_cache: Optional[Tuple[float, Dict[str, Dict[str, int]]]] = None
+            
+            # Índices que existen de verdad (ensure_indexes es best-effort): solo se hace hint
+            # a esos, y sin índice de texto search_text cae a $regex (text_search_filter)
+            self._set_index_keys(self._list_index_keys())
+            self._text_fallback_warned = False
+            
+            # Recálculo de front_filter_values en curso (single-flight, ver refresh_filter_values)
+            self._filter_values_refresh: Optional[asyncio.Task] = None
+            self._filter_values_refresh_forced = False
+            
             logger.info(f"✅ MongoDB connected: {settings.MONGODB_DB}/{settings.MONGODB_COLLECTION}")
             
         except ServerSelectionTimeoutError as e:
@@ -70,6 +393,7 @@ class MongoRepository:
         filters: Optional[Dict[str, Any]] = None,
         top_k: int = 8,
         min_similarity: float = 0.70,
+        text_limit: Optional[int] = None,
     ) -> List[Dict[str, Any]]:
         """
         Buscar por similitud vectorial usando MongoDB Atlas Vector Search.
@@ -80,93 +404,67 @@ class MongoRepository:
             filters: Filtros facetados opcionales (organism, mission_env, etc.)
             top_k: Número de resultados a retornar
             min_similarity: Similitud mínima (score threshold)
+            text_limit: Truncar `text` a N caracteres en el servidor ($substrCP)
         
         Returns:
             Lista de chunks con metadata, text y similarity score
         """
+        # Definidos antes del try: el except los usa para diagnosticar el pre-filtro
+        settings = get_settings()
+        match_conditions = {}
+        prefilter = False
         try:
-            # Step 1: Build $vectorSearch stage (MUST be first in pipeline)
+            # Step 1: Build metadata filters
+            
+            if filters:
+                for field in VECTOR_FILTER_FIELDS:
+                    values = filters.get(field)
+                    if values:
+                        match_conditions[field] = {"$in": values}
+                
+                tags = filters.get("tags")
+                if tags:
+                    # Use $in to match any of the provided tags in the metadata.tags array
+                    match_conditions["metadata.tags"] = {"$in": tags}
+                
+                year_range = filters.get("year_range")
+                if year_range:
+                    year_min, year_max = year_range
+                    match_conditions["year"] = {"$gte": year_min, "$lte": year_max}
+            
+            # Step 2: Build $vectorSearch stage (MUST be first in pipeline)
             # numCandidates should be higher than limit for better recall
             num_candidates = max(top_k * 10, 100)
+            vector_search = {
+                "index": settings.MONGODB_VECTOR_INDEX,  # "vector_index"
+                "path": "embedding",
+                "queryVector": query_vec,
+                "numCandidates": num_candidates,
+                "limit": top_k
+            }
+            
+            # Con pre-filtro el ANN solo recorre candidatos que cumplen los filtros: devuelve top_k
+            # resultados aunque los filtros sean selectivos (un $match posterior descarta candidatos)
+            prefilter = settings.MONGODB_VECTOR_PREFILTER and bool(match_conditions)
+            if prefilter:
+                vector_search["filter"] = match_conditions
             
             pipeline = [
-                {
-                    "$vectorSearch": {
-                        "index": settings.MONGODB_VECTOR_INDEX,  # "vector_index"
-                        "path": "embedding",
-                        "queryVector": query_vec,
-                        "numCandidates": num_candidates,
-                        "limit": top_k
-                    }
-                },
-                # Step 2: Add similarity score as a field
-                {
+                {"$vectorSearch": vector_search},
+                # Step 3: Add similarity score as a field
+                VECTOR_SEARCH_PROJECTION if not text_limit else {
                     "$project": {
-                        "_id": 1,  # Include MongoDB _id
-                        "source_id": 1,
-                        "title": 1,
-                        "text": 1,
-                        "abstract": 1,  # Include abstract
-                        "publication_year": 1,  # Include publication_year
-                        "section": 1,
-                        "doi": 1,
-                        "osdr_id": 1,
-                        "organism": 1,
-                        "system": 1,
-                        "mission_env": 1,
-                        "exposure": 1,
-                        "assay": 1,
-                        "tissue": 1,
-                        "year": 1,  # Keep for backwards compatibility
-                        "venue": 1,
-                        "url": 1,
-                        "source_url": 1,  # Include source_url
-                        "source_type": 1,
-                        "chunk_index": 1,
-                        "total_chunks": 1,
-                        "created_at": 1,
-                        "metadata": 1,  # Include complete metadata object
-                        # Get the vector search score
-                        "similarity": {"$meta": "vectorSearchScore"}
+                        **VECTOR_SEARCH_PROJECTION["$project"],
+                        "text": {"$substrCP": ["$text", 0, text_limit]}
                     }
                 }
             ]
             
-            # Step 3: Add metadata filters (AFTER $vectorSearch)
-            match_conditions = {}
-            
-            if filters:
-                if "organism" in filters and filters["organism"]:
-                    match_conditions["organism"] = {"$in": filters["organism"]}
-                
-                if "mission_env" in filters and filters["mission_env"]:
-                    match_conditions["mission_env"] = {"$in": filters["mission_env"]}
-                
-                if "system" in filters and filters["system"]:
-                    match_conditions["system"] = {"$in": filters["system"]}
-                
-                if "exposure" in filters and filters["exposure"]:
-                    match_conditions["exposure"] = {"$in": filters["exposure"]}
-                
-                if "assay" in filters and filters["assay"]:
-                    match_conditions["assay"] = {"$in": filters["assay"]}
-                
-                if "tissue" in filters and filters["tissue"]:
-                    match_conditions["tissue"] = {"$in": filters["tissue"]}
-                
-                if "tags" in filters and filters["tags"]:
-                    # Use $in to match any of the provided tags in the metadata.tags array
-                    match_conditions["metadata.tags"] = {"$in": filters["tags"]}
-                
-                if "year_range" in filters and filters["year_range"]:
-                    year_min, year_max = filters["year_range"]
-                    match_conditions["year"] = {"$gte": year_min, "$lte": year_max}
-            
-            # Add $match stage if we have filters
-            if match_conditions:
+            # Step 4: Sin pre-filtro, filtrar metadata AFTER $vectorSearch
+            if match_conditions and not prefilter:
                 pipeline.append({"$match": match_conditions})
             
-            # Step 4: Filter by minimum similarity score
+            # Step 5: Filter by minimum similarity score
             if min_similarity > 0:
                 pipeline.append({
                     "$match": {
@@ -174,28 +472,34 @@ class MongoRepository:
                     }
                 })
             
-            # Step 5: Execute pipeline
-            filters_info = []
-            if filters:
-                if filters.get("tags"):
-                    filters_info.append(f"tags={filters['tags']}")
-                if filters.get("organism"):
-                    filters_info.append(f"organism={filters['organism']}")
-                if filters.get("mission_env"):
-                    filters_info.append(f"mission_env={filters['mission_env']}")
-            
-            filter_desc = f" | filters: {', '.join(filters_info)}" if filters_info else ""
-            logger.info(f"🔍 Vector search: top_k={top_k}, numCandidates={num_candidates}, min_sim={min_similarity}{filter_desc}")
+            # Step 6: Execute pipeline (el resumen de filtros solo se arma si el log INFO está activo)
+            if logger.isEnabledFor(logging.INFO):
+                filters_info = []
+                if filters:
+                    if filters.get("tags"):
+                        filters_info.append(f"tags={filters['tags']}")
+                    if filters.get("organism"):
+                        filters_info.append(f"organism={filters['organism']}")
+                    if filters.get("mission_env"):
+                        filters_info.append(f"mission_env={filters['mission_env']}")
+                
+                filter_desc = f" | filters: {', '.join(filters_info)}" if filters_info else ""
+                logger.info(
+                    f"🔍 Vector search: top_k={top_k}, numCandidates={num_candidates}, min_sim={min_similarity}, "
+                    f"prefilter={prefilter}{filter_desc}"
+                )
             
-            results = list(self.collection.aggregate(pipeline))
+            # Como mucho top_k resultados: un solo batch
+            results = list(self.collection.aggregate(pipeline, batchSize=top_k))
             
             # Log results
             if results:
-                scores = [r.get("similarity", 0) for r in results]
-                logger.info(
-                    f"📊 Found {len(results)} chunks | "
-                    f"Scores: max={max(scores):.4f}, min={min(scores):.4f}, avg={sum(scores)/len(scores):.4f}"
-                )
+                if logger.isEnabledFor(logging.INFO):
+                    scores = [r.get("similarity", 0) for r in results]
+                    logger.info(
+                        f"📊 Found {len(results)} chunks | "
+                        f"Scores: max={max(scores):.4f}, min={min(scores):.4f}, avg={sum(scores)/len(scores):.4f}"
+                    )
             else:
                 logger.warning(f"⚠️ No results found. Check:")
                 logger.warning(f"   1. Vector index 'vector_index' exists in Atlas")
@@ -206,7 +510,14 @@ class MongoRepository:
         
         except PyMongoError as e:
             logger.error(f"❌ MongoDB vector search error: {type(e).__name__}: {e}")
-            logger.error(f"💡 If index error: Create 'vector_index' in MongoDB Atlas (see CREAR_INDICE_VECTORIAL.md)")
+            if prefilter:
+                # Con pre-filtro, un campo sin `"type": "filter"` en el índice hace fallar $vectorSearch
+                logger.error(
+                    f"💡 $vectorSearch prefilter failed on {sorted(match_conditions)}: each path must be a "
+                    f"filter field of '{settings.MONGODB_VECTOR_INDEX}' (see README) or set MONGODB_VECTOR_PREFILTER=false"
+                )
+            else:
+                logger.error(f"💡 If index error: Create 'vector_index' in MongoDB Atlas (see CREAR_INDICE_VECTORIAL.md)")
             return []
     
     def get_by_ids(self, ids: List[str]) -> List[Dict[str, Any]]:
@@ -214,7 +525,7 @@ class MongoRepository:
         try:
             results = list(self.collection.find(
                 {"source_id": {"$in": ids}},
-                {"_id": 0}  # Excluir _id de MongoDB
+                {"_id": 0, "embedding": 0}  # Excluir _id y el vector (1536 floats por chunk)
             ))
             return results
         except PyMongoError as e:
@@ -225,36 +536,49 @@ class MongoRepository:
         """
         Obtener conteos de facets (para UI de filtros).
         
+        Se cachea en memoria FACET_COUNTS_CACHE_TTL segundos: los conteos solo cambian
+        con cada ingesta (refresh_filter_values invalida el cache).
+        
         Returns:
             Dict con conteos por facet: {"organism": {"Mus musculus": 123, ...}, ...}
         """
+        settings = get_settings()
+        cached = self._facet_counts_cache
+        if cached is not None and cached[0] > monotonic():
+            return cached[1]
+        
         try:
             facet_fields = ["organism", "system", "mission_env", "exposure", "assay", "tissue"]
-            result = {}
             
-            for field in facet_fields:
-                pipeline = [
-                    {"$match": {"pk": settings.NASA_DEFAULT_ORG}},
+            # Un solo recorrido de la partición: cada facet es una sub-pipeline de $facet
+            facets = {
+                field: [
                     {"$group": {"_id": f"${field}", "count": {"$sum": 1}}},
                     {"$sort": {"count": -1}}
                 ]
-                
-                counts = list(self.collection.aggregate(pipeline))
-                result[field] = {item["_id"]: item["count"] for item in counts if item["_id"]}
-            
-            # Add tags facet counts
-            tags_pipeline = [
-                {"$match": {"pk": settings.NASA_DEFAULT_ORG, "metadata.tags": {"$exists": True, "$ne": []}}},
+                for field in facet_fields
+            }
+            facets["tags"] = [
+                {"$match": {"metadata.tags": {"$exists": True, "$ne": []}}},
                 {"$unwind": "$metadata.tags"},
                 {"$group": {"_id": "$metadata.tags", "count": {"$sum": 1}}},
                 {"$sort": {"count": -1}},
                 {"$limit": 50}  # Top 50 most common tags
             ]
+            pipeline = [
+                {"$match": {"pk": settings.NASA_DEFAULT_ORG}},
+                {"$facet": facets}
+            ]
             
-            tags_counts = list(self.collection.aggregate(tags_pipeline))
-            result["tags"] = {item["_id"]: item["count"] for item in tags_counts if item["_id"]}
+            facet = next(self.collection.aggregate(pipeline), {})
+            result = {
+                field: {item["_id"]: item["count"] for item in facet.get(field, []) if item["_id"]}
+                for field in facets
+            }
             
             logger.info(f"📊 Facet counts computed for {len(facet_fields)} fields + tags ({len(result['tags'])} tags)")
+            if settings.FACET_COUNTS_CACHE_TTL > 0:
+                self._facet_counts_cache = (monotonic() + settings.FACET_COUNTS_CACHE_TTL, result)
             return result
         except PyMongoError as e:
             logger.error(f"❌ facet_counts error: {e}")
@@ -281,10 +605,11 @@ class MongoRepository:
             
             chunks = list(
                 self.collection
-                .find(query)
+                .find(query, {"embedding": 0})  # Excluir embedding para performance
                 .skip(skip)
                 .limit(limit)
                 .sort("_id", -1)  # Más recientes primero
+                .batch_size(limit)  # La página completa en un solo batch
             )
             
             logger.info(f"📄 Retrieved {len(chunks)} chunks (filters: {query})")
@@ -315,57 +640,133 @@ class MongoRepository:
             logger.error(f"❌ count_all_chunks error: {e}")
             return 0
     
-    def get_unique_papers(self, skip: int = 0, limit: int = 100, filters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+    async def get_unique_papers_page(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> Tuple[List[Dict[str, Any]], int]:
         """
-        Obtener papers únicos agrupados por pk (1 resultado por paper)
+        Página de papers únicos + total en una sola agregación ($facet).
         
-        Args:
-            skip: Papers a saltar para paginación
-            limit: Límite de papers a retornar
-            filters: Filtros opcionales (ej: {"metadata.category": "space"})
+        Página (orden por primer chunk, más recientes primero) + count_unique_papers
+        con un solo round-trip y un solo $group sobre la colección.
         
         Returns:
-            Lista de papers únicos con metadata agregada
+            (papers de la página, total de papers únicos que cumplen los filtros)
         """
         try:
-            # Pipeline de agregación
             pipeline = []
             
-            # Agregar filtros si existen
             if filters:
                 pipeline.append({"$match": filters})
             
-            # Agrupar por pk (cada paper único)
             pipeline.extend([
+                PAPER_SOURCE_PROJECTION,
+                UNIQUE_PAPER_GROUP,
                 {
-                    "$group": {
-                        "_id": "$pk",  # Agrupar por pk
-                        "pk": {"$first": "$pk"},
-                        "source_type": {"$first": "$source_type"},
-                        "source_url": {"$first": "$source_url"},
-                        "category": {"$first": "$metadata.category"},
-                        "tags": {"$first": "$metadata.tags"},
-                        "article_metadata": {"$first": "$metadata.article_metadata"},
-                        "total_chunks": {"$sum": 1},  # Contar chunks
-                        "text_preview": {"$first": "$text"},  # Preview del primer chunk
-                        "first_chunk_id": {"$first": "$_id"}  # ID del primer chunk
+                    "$facet": {
+                        "data": [
+                            {"$sort": {"first_chunk_id": -1}},  # Más recientes primero
+                            {"$skip": skip},
+                            {"$limit": limit},
+                            {"$project": PAPER_LIST_PROJECTION}
+                        ],
+                        "total": [{"$count": "n"}]
                     }
-                },
-                {"$sort": {"first_chunk_id": -1}},  # Más recientes primero
-                {"$skip": skip},
-                {"$limit": limit}
+                }
             ])
             
-            papers = list(self.collection.aggregate(pipeline))
+            result = await self.async_collection.aggregate(pipeline, **self._hint_kwargs(filters)).to_list(length=1)
+            facet = result[0] if result else {}
+            papers = facet.get("data", [])
+            total = facet["total"][0]["n"] if facet.get("total") else 0
             
-            logger.info(f"📄 Retrieved {len(papers)} unique papers (filters: {filters})")
-            return papers
+            logger.info(f"📄 Retrieved {len(papers)}/{total} unique papers (filters: {filters})")
+            return papers, total
             
         except PyMongoError as e:
-            logger.error(f"❌ get_unique_papers error: {e}")
-            return []
+            logger.error(f"❌ get_unique_papers_page error: {e}")
+            return [], 0
     
-    def count_unique_papers(self, filters: Optional[Dict[str, Any]] = None) -> int:
+    async def iter_unique_papers_keyset(
+        self,
+        after: Optional[str] = None,
+        skip: int = 0,
+        limit: int = 100,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Paginación keyset (seek) de papers únicos, ordenados por pk.
+        
+        En lugar de saltar N papers, filtra `pk > after` antes de agrupar
+        (usa el índice de pk), así el costo de una página no crece con su posición.
+        
+        Dos fases para no agrupar todos los chunks restantes de la colección:
+        1. pks de la página: ventanas de chunks ordenados por pk con $limit ANTES del
+           $group (IXSCAN acotado del índice de pk), hasta juntar `skip + limit` pks.
+           El costo depende del tamaño de la página, no de cuántos papers quedan.
+        2. Metadata + total_chunks solo de esos `limit` papers.
+        Los papers de la fase 2 se entregan a medida que llegan del cursor (sin
+        materializar la página en una lista intermedia). El total se obtiene con
+        count_unique_papers.
+        
+        Args:
+            after: pk del último paper de la página anterior (None = primera página)
+            skip: Offset adicional (compatibilidad con clientes skip/limit)
+            limit: Límite de papers a retornar
+            filters: Filtros opcionales (ej: {"metadata.category": "space"})
+        """
+        wanted = skip + limit
+        window = max(wanted * KEYSET_CHUNKS_PER_PAPER, 1)
+        
+        try:
+            pks: List[str] = []
+            last_pk = after
+            while len(pks) < wanted:
+                window_match = dict(filters) if filters else {}
+                if last_pk is not None:
+                    window_match["pk"] = {"$gt": last_pk}
+                pk_pipeline = [
+                    {"$match": window_match},
+                    {"$sort": {"pk": 1}},
+                    {"$limit": window},  # Acota los chunks leídos antes de agrupar
+                    {"$group": {"_id": "$pk", "chunks": {"$sum": 1}}},
+                    {"$sort": {"_id": 1}},
+                ]
+                groups = await self.async_collection.aggregate(
+                    pk_pipeline, **self._hint_kwargs(window_match)
+                ).to_list(length=None)
+                pks.extend(group["_id"] for group in groups)
+                # Ventana incompleta => no quedan más chunks. El último pk de una ventana
+                # llena puede estar cortado: da igual, solo se necesita el pk
+                if not groups or sum(group["chunks"] for group in groups) < window:
+                    break
+                last_pk = groups[-1]["_id"]
+            
+            page_pks = pks[skip:wanted]
+            if not page_pks:
+                logger.info(f"📄 Streamed 0 unique papers after={after!r} (filters: {filters})")
+                return
+            
+            # Los filtros se repiten para que total_chunks cuente lo mismo que antes
+            pipeline = [
+                {"$match": {**(filters or {}), "pk": {"$in": page_pks}}},
+                PAPER_SOURCE_PROJECTION,
+                UNIQUE_PAPER_GROUP,
+                {"$sort": {"_id": 1}},  # _id == pk
+                {"$project": PAPER_LIST_PROJECTION}
+            ]
+            
+            count = 0
+            async for paper in self.async_collection.aggregate(pipeline, batchSize=limit):
+                count += 1
+                yield paper
+            logger.info(f"📄 Streamed {count} unique papers after={after!r} (filters: {filters})")
+        except PyMongoError as e:
+            logger.error(f"❌ iter_unique_papers_keyset error: {e}")
+    
+    async def count_unique_papers(self, filters: Optional[Dict[str, Any]] = None) -> int:
         """
         Contar total de papers únicos (agrupados por pk)
         
@@ -389,7 +790,7 @@ class MongoRepository:
                 {"$count": "total"}
             ])
             
-            result = list(self.collection.aggregate(pipeline))
+            result = await self.async_collection.aggregate(pipeline, **self._hint_kwargs(filters)).to_list(length=None)
             total = result[0]["total"] if result else 0
             
             logger.info(f"📊 Total unique papers: {total} (filters: {filters})")
@@ -420,64 +821,14 @@ class MongoRepository:
             
             # Continúa con el resto del pipeline original
             pipeline.extend([
-                {
-                    "$group": {
-                        "_id": "$doi",  # Agrupar por DOI para evitar duplicados
-                        "source_id": {"$first": "$source_id"},
-                        "title": {"$first": "$title"},
-                        "year": {"$first": "$year"},
-                        "doi": {"$first": "$doi"},
-                        "osdr_id": {"$first": "$osdr_id"},
-                        "organism": {"$first": "$organism"},
-                        "mission_env": {"$first": "$mission_env"},
-                        "exposure": {"$first": "$exposure"},
-                        "system": {"$first": "$system"},
-                        "tissue": {"$first": "$tissue"},
-                        "assay": {"$first": "$assay"},
-                        "chunk_count": {"$sum": 1},
-                        "text_preview": {"$first": "$text"},  # Preview del primer chunk
-                        # Nuevos campos para frontend
-                        "pk": {"$first": "$pk"},
-                        "source_type": {"$first": "$source_type"},
-                        "source_url": {"$first": "$source_url"},
-                        "category": {"$first": "$metadata.category"},
-                        "tags": {"$first": "$metadata.tags"},
-                        "article_metadata": {"$first": "$metadata.article_metadata"},
-                        "total_chunks": {"$sum": 1}
-                    }
-                },
+                LEGACY_DOCUMENT_GROUP,
                 {"$sort": {"year": -1}},
                 {"$skip": skip},
                 {"$limit": limit},
-                {
-                    "$project": {
-                        "_id": 0,
-                        "pk": 1,
-                        "title": 1,
-                        "source_type": 1,
-                        "source_url": 1,
-                        "category": 1,
-                        "tags": 1,
-                        "total_chunks": 1,
-                        "article_metadata": 1,
-                        # Campos legacy para compatibilidad
-                        "source_id": 1,
-                        "year": 1,
-                        "doi": 1,
-                        "osdr_id": 1,
-                        "organism": 1,
-                        "mission_env": 1,
-                        "exposure": 1,
-                        "system": 1,
-                        "tissue": 1,
-                        "assay": 1,
-                        "chunk_count": 1,
-                        "text_preview": {"$substr": ["$text_preview", 0, 200]}  # Primeros 200 chars
-                    }
-                }
+                LEGACY_DOCUMENT_PROJECTION
             ])
             
-            documents = list(self.collection.aggregate(pipeline))
+            documents = list(self.collection.aggregate(pipeline, batchSize=limit))
             logger.info(f"📄 Retrieved {len(documents)} unique documents (filters: {filters})")
             return documents
         except PyMongoError as e:
@@ -499,10 +850,7 @@ class MongoRepository:
                 if "pmc_id" in filters and filters["pmc_id"]:
                     match_query["metadata.article_metadata.pmc_id"] = filters["pmc_id"]
                 if "search_text" in filters and filters["search_text"]:
-                    match_query["$or"] = [
-                        {"text": {"$regex": filters["search_text"], "$options": "i"}},
-                        {"title": {"$regex": filters["search_text"], "$options": "i"}},
-                    ]
+                    match_query.update(self.text_search_filter(filters["search_text"]))
             
             # Contar documentos únicos por DOI
             pipeline = [
@@ -537,88 +885,130 @@ class MongoRepository:
                 match_query["source_type"] = filters["source_type"]
             if "pmc_id" in filters and filters["pmc_id"]:
                 match_query["metadata.article_metadata.pmc_id"] = filters["pmc_id"]
-            if "search_text" in filters and filters["search_text"]:
+            if filters.get("search_text"):
                 # Búsqueda de texto en título, contenido o tags
-                match_query["$or"] = [
-                    {"text": {"$regex": filters["search_text"], "$options": "i"}},
-                    {"metadata.article_metadata.title": {"$regex": filters["search_text"], "$options": "i"}},
-                    {"metadata.tags": {"$regex": filters["search_text"], "$options": "i"}}
-                ]
+                match_query.update(self.text_search_filter(filters["search_text"]))
+            text_search = "$text" in match_query  # Con índice de texto: ordenar por relevancia
             
             pipeline = [
                 {"$match": match_query} if match_query else {"$match": {}},
-                {
-                    "$group": {
-                        "_id": "$pk",
-                        "pk": {"$first": "$pk"},
-                        "title": {"$first": "$metadata.article_metadata.title"},
-                        "source_type": {"$first": "$source_type"},
-                        "source_url": {"$first": "$source_url"},
-                        "category": {"$first": "$metadata.category"},
-                        "tags": {"$first": "$metadata.tags"},
-                        "total_chunks": {"$sum": 1},
-                        "article_metadata": {"$first": "$metadata.article_metadata"}
-                    }
-                },
-                {"$sort": {"pk": 1}},
+                PAPER_SOURCE_PROJECTION,  # Descarta text/embedding antes de agrupar
+                # Relevancia del paper con $text: mejor textScore de sus chunks
+                TEXT_SCORED_PAPER_GROUP if text_search else UNIQUE_PAPER_GROUP,
+                {"$sort": {"score": -1, "pk": 1} if text_search else {"pk": 1}},
                 {"$skip": skip},
                 {"$limit": limit},
-                {
-                    "$project": {
-                        "_id": 0,
-                        "pk": 1,
-                        "title": 1,
-                        "source_type": 1,
-                        "source_url": 1,
-                        "category": 1,
-                        "tags": 1,
-                        "total_chunks": 1,
-                        "article_metadata": 1
-                    }
-                }
+                {"$project": PAPER_LIST_PROJECTION}
             ]
             
-            documents = list(self.collection.aggregate(pipeline))
+            documents = list(self.collection.aggregate(pipeline, batchSize=limit))
             logger.info(f"🔍 Found {len(documents)} documents matching filters")
             return documents
         except PyMongoError as e:
             logger.error(f"❌ search_documents_by_filters error: {e}")
             return []
     
-    def get_document_by_id(self, pk: str) -> Optional[Dict[str, Any]]:
-        """Obtener todos los chunks de un documento específico"""
+    async def get_document_chunks(
+        self,
+        pk: str,
+        skip: int = 0,
+        limit: int = 20
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Página de chunks de un documento (ordenados por chunk_index) + total de chunks
+        
+        Returns:
+            (chunks de la página, total de chunks del documento)
+        """
         try:
-            # Buscar todos los chunks del documento
-            chunks = list(self.collection.find(
-                {"pk": pk},
-                {"_id": 0, "embedding": 0}  # Excluir _id y embedding
-            ).sort("chunk_index", 1))
+            chunks, total = await asyncio.gather(
+                self.async_collection.find({"pk": pk}, CHUNK_DETAIL_PROJECTION)
+                .sort("chunk_index", 1)
+                .skip(skip)
+                .limit(limit)
+                .batch_size(limit)  # La página llega en un solo batch (sin getMore)
+                .to_list(length=None),
+                self.async_collection.count_documents({"pk": pk}),
+            )
+            return chunks, total
+        except PyMongoError as e:
+            logger.error(f"❌ get_document_chunks error: {e}")
+            return [], 0
+    
+    async def get_document_by_id(
+        self,
+        pk: str,
+        chunk_skip: int = 0,
+        chunk_limit: int = 20
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Obtener metadata de un documento + una página de sus chunks.
+        El resto de chunks se pide bajo demanda (get_document_chunks / iter_document_chunks).
+        Con chunk_limit=0 solo se trae la metadata y el total.
+        """
+        try:
+            # Metadata (primer chunk), página de chunks y total en un solo round-trip.
+            # Un solo $sort antes del $facet (usa el índice pk+chunk_index) y sin embedding:
+            # las ramas del $facet reciben documentos livianos ya ordenados
+            facet_stages = {
+                "meta": [
+                    {"$limit": 1},
+                    DOCUMENT_META_PROJECTION  # sin text: solo la metadata del paper
+                ],
+                "total_chunks": [{"$count": "n"}]
+            }
+            if chunk_limit > 0:
+                facet_stages["chunks"] = [
+                    {"$skip": chunk_skip},
+                    {"$limit": chunk_limit},
+                    {"$project": CHUNK_BODY_PROJECTION}
+                ]
+            pipeline = [
+                {"$match": {"pk": pk}},
+                {"$sort": {"chunk_index": 1}},
+                {"$project": {"embedding": 0}},
+                {"$facet": facet_stages}
+            ]
+            result = await self.async_collection.aggregate(pipeline).to_list(length=1)
+            facet = result[0] if result else {}
             
-            if not chunks:
+            if not facet.get("meta"):
                 return None
             
-            first_chunk = chunks[0]
-            metadata = first_chunk.get("metadata", {})
-            article_metadata = metadata.get("article_metadata", {})
+            metadata = facet["meta"][0]
+            total = facet["total_chunks"][0]["n"]
+            metadata["total_chunks"] = total
+            if not metadata.get("article_metadata"):
+                metadata["article_metadata"] = None
             
             return {
-                "metadata": {
-                    "pk": first_chunk.get("pk"),
-                    "title": article_metadata.get("title", ""),
-                    "source_type": first_chunk.get("source_type"),
-                    "source_url": first_chunk.get("source_url"),
-                    "category": metadata.get("category"),
-                    "tags": metadata.get("tags", []),
-                    "total_chunks": len(chunks),
-                    "article_metadata": article_metadata
-                },
-                "chunks": chunks,
-                "total_chunks": len(chunks)
+                "metadata": metadata,
+                "chunks": facet.get("chunks", []),
+                "total_chunks": total
             }
         except PyMongoError as e:
             logger.error(f"❌ get_document_by_id error: {e}")
             return None
     
+    async def iter_document_chunks(self, pk: str, batch_size: int = CHUNK_CURSOR_BATCH_SIZE) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Todos los chunks de un documento (CHUNK_BODY_PROJECTION, ordenados por chunk_index),
+        entregados a medida que llegan del cursor: para respuestas en streaming.
+        Un PyMongoError a mitad del cursor se propaga: terminar en silencio dejaría un
+        stream truncado que parece completo.
+        """
+        try:
+            cursor = (
+                self.async_collection.find({"pk": pk}, CHUNK_BODY_PROJECTION)
+                .sort("chunk_index", 1)
+                .batch_size(batch_size)
+            )
+            async for chunk in cursor:
+                yield chunk
+        except PyMongoError as e:
+            logger.error(f"❌ iter_document_chunks error: {e}")
+            raise
+    
     def get_chunks_by_document_id(self, document_id: str) -> List[Dict[str, Any]]:
         """
         📄 Obtener chunks por _id de MongoDB
@@ -630,27 +1020,22 @@ class MongoRepository:
             Lista de chunks pertenecientes al documento
         """
         try:
-            from bson import ObjectId
+            chunks = []
             
-            # Convertir string a ObjectId
-            try:
-                object_id = ObjectId(document_id)
-            except:
-                logger.error(f"❌ Invalid ObjectId format: {document_id}")
-                return []
-            
-            # Buscar chunks con el _id especificado
-            chunks = list(self.collection.find(
-                {"_id": object_id},
-                {"embedding": 0}  # Excluir embedding para performance
-            ).sort("chunk_index", 1))
-            
-            # Si no encuentra por _id, intentar por pk (compatibilidad)
+            # Buscar chunks con el _id especificado (sin lanzar/capturar InvalidId por request)
+            if ObjectId.is_valid(document_id):
+                chunks = list(self.collection.find(
+                    {"_id": ObjectId(document_id)},
+                    {"embedding": 0}  # Excluir embedding para performance
+                ).sort("chunk_index", 1))
+            
+            # Si no encuentra por _id, intentar por pk (compatibilidad).
+            # Documento completo sin límite: para no tenerlo entero en memoria usar iter_document_chunks
             if not chunks:
                 chunks = list(self.collection.find(
                     {"pk": document_id},
                     {"embedding": 0}
-                ).sort("chunk_index", 1))
+                ).sort("chunk_index", 1).batch_size(CHUNK_CURSOR_BATCH_SIZE))
             
             logger.info(f"📄 Found {len(chunks)} chunks for document_id: {document_id}")
             return chunks
@@ -659,50 +1044,137 @@ class MongoRepository:
             logger.error(f"❌ get_chunks_by_document_id error: {e}")
             return []
     
-    def get_filter_values(self) -> Dict[str, List[Any]]:
-        """Obtener todos los valores únicos para cada filtro"""
+    async def get_filter_values(self) -> Dict[str, List[Any]]:
+        """
+        Valores de filtros desde la vista materializada (FILTER_VALUES_COLLECTION, 1 documento).
+        Si todavía no existe se calcula y se guarda (refresh_filter_values).
+        `version` identifica el contenido: solo cambia cuando cambian los valores o en un
+        refresh forzado (ingesta), igual en todos los workers.
+        """
         try:
-            result = {}
-            
-            # Obtener categorías únicas
-            categories_pipeline = [
-                {"$match": {"metadata.category": {"$exists": True, "$ne": None}}},
-                {"$group": {"_id": "$metadata.category"}},
-                {"$sort": {"_id": 1}}
-            ]
-            categories = list(self.collection.aggregate(categories_pipeline))
-            result["categories"] = [item["_id"] for item in categories if item["_id"]]
-            
-            # Obtener source_types únicos
-            source_types_pipeline = [
-                {"$match": {"source_type": {"$exists": True, "$ne": None}}},
-                {"$group": {"_id": "$source_type"}},
-                {"$sort": {"_id": 1}}
-            ]
-            source_types = list(self.collection.aggregate(source_types_pipeline))
-            result["source_types"] = [item["_id"] for item in source_types if item["_id"]]
+            doc = await self.async_database[FILTER_VALUES_COLLECTION].find_one(
+                {"_id": FILTER_VALUES_DOC_ID}, {"_id": 0, "refreshed_at": 0, "content_hash": 0}
+            )
+        except PyMongoError as e:
+            logger.error(f"❌ get_filter_values error: {e}")
+            return {}
+        if doc:
+            return doc
+        return await self.refresh_filter_values()
+    
+    async def refresh_filter_values(self, force: bool = False) -> Dict[str, List[Any]]:
+        """
+        Recalcular los valores de filtros y guardarlos en la vista materializada.
+        Sin `force` solo se reescribe (y cambia `version`) si los valores cambiaron;
+        `force=True` (hook de ingesta) siempre publica una versión nueva, porque una
+        ingesta puede editar títulos o metadata sin cambiar estos valores.
+        Single-flight: las llamadas concurrentes esperan la misma agregación en vez de lanzar otra.
+        """
+        task = self._filter_values_refresh
+        if force and task is not None and not task.done() and not self._filter_values_refresh_forced:
+            # Hay un recálculo sin force en curso: esperarlo y lanzar el forzado después
+            await asyncio.gather(asyncio.shield(task), return_exceptions=True)
+            task = self._filter_values_refresh
+        if task is None or task.done():
+            self._filter_values_refresh_forced = force
+            task = self._filter_values_refresh = asyncio.create_task(self._refresh_filter_values(force))
+        # shield: si un request se cancela, el recálculo sigue para los demás
+        return await asyncio.shield(task)
+    
+    async def _refresh_filter_values(self, force: bool) -> Dict[str, List[Any]]:
+        self._facet_counts_cache = None  # Nueva ingesta: los conteos de facets también cambiaron
+        result = await self._compute_filter_values()
+        if not result:
+            return result
+        
+        content_hash = hashlib.blake2b(orjson.dumps(result, option=orjson.OPT_SORT_KEYS), digest_size=8).hexdigest()
+        refreshed_at = datetime.now(timezone.utc)
+        collection = self.async_database[FILTER_VALUES_COLLECTION]
+        try:
+            stored = await collection.find_one({"_id": FILTER_VALUES_DOC_ID}, {"content_hash": 1, "version": 1})
+            if not force and stored and stored.get("content_hash") == content_hash and stored.get("version"):
+                # Sin cambios: misma versión (los ETags siguen valiendo), sin reescribir
+                return {**result, "version": stored["version"]}
             
-            # Obtener top 50 tags más comunes
-            tags_pipeline = [
-                {"$match": {"metadata.tags": {"$exists": True, "$ne": []}}},
-                {"$unwind": "$metadata.tags"},
-                {"$group": {"_id": "$metadata.tags", "count": {"$sum": 1}}},
-                {"$sort": {"count": -1}},
-                {"$limit": 50},
-                {"$project": {"_id": 1}}
+            version = content_hash
+            if force:
+                version = hashlib.blake2b(
+                    f"{content_hash}:{refreshed_at.isoformat()}".encode(), digest_size=8
+                ).hexdigest()
+            await collection.replace_one(
+                {"_id": FILTER_VALUES_DOC_ID},
+                {**result, "version": version, "content_hash": content_hash, "refreshed_at": refreshed_at},
+                upsert=True,
+            )
+            logger.info(f"🔄 Filter values materialized in {FILTER_VALUES_COLLECTION} (version={version})")
+        except PyMongoError as e:
+            # Sin permisos de escritura: se sigue sirviendo el valor calculado
+            logger.warning(f"⚠️ Could not materialize filter values: {e}")
+            version = content_hash
+        return {**result, "version": version}
+    
+    async def try_acquire_refresh_lease(self, ttl: int) -> bool:
+        """
+        Lease del recálculo periódico en MongoDB: entre todos los workers, solo uno lo
+        obtiene cada `ttl` segundos (los demás chocan con el _id del lease vigente).
+        """
+        now = datetime.now(timezone.utc)
+        try:
+            await self.async_database[FILTER_VALUES_COLLECTION].update_one(
+                {"_id": FILTER_VALUES_LEASE_ID, "until": {"$lte": now}},
+                {"$set": {"until": now + timedelta(seconds=ttl)}},
+                upsert=True,
+            )
+            return True
+        except DuplicateKeyError:
+            return False  # Otro worker tiene el lease vigente
+        except PyMongoError as e:
+            logger.warning(f"⚠️ Could not acquire filter values refresh lease: {e}")
+            return False
+    
+    async def _compute_filter_values(self) -> Dict[str, List[Any]]:
+        """Obtener todos los valores únicos para cada filtro (escanea la colección)"""
+        try:
+            # Categorías, source_types, top tags y total de papers en un solo recorrido ($facet)
+            pipeline = [
+                {"$facet": {
+                    "categories": [
+                        {"$match": {"metadata.category": {"$exists": True, "$ne": None}}},
+                        {"$group": {"_id": "$metadata.category"}},
+                        {"$sort": {"_id": 1}}
+                    ],
+                    "source_types": [
+                        {"$match": {"source_type": {"$exists": True, "$ne": None}}},
+                        {"$group": {"_id": "$source_type"}},
+                        {"$sort": {"_id": 1}}
+                    ],
+                    # Top 50 tags más comunes
+                    "tags": [
+                        {"$match": {"metadata.tags": {"$exists": True, "$ne": []}}},
+                        {"$unwind": "$metadata.tags"},
+                        {"$group": {"_id": "$metadata.tags", "count": {"$sum": 1}}},
+                        {"$sort": {"count": -1}},
+                        {"$limit": 50},
+                        {"$project": {"_id": 1}}
+                    ],
+                    "total_documents": [
+                        {"$group": {"_id": "$pk"}},
+                        {"$count": "total"}
+                    ],
+                }}
             ]
-            tags = list(self.collection.aggregate(tags_pipeline))
-            result["tags"] = [item["_id"] for item in tags if item["_id"]]
+            facets = await self.async_collection.aggregate(pipeline).to_list(length=1)
+            facet = facets[0] if facets else {}
             
-            # Contar documentos y chunks totales
-            total_docs_pipeline = [
-                {"$group": {"_id": "$pk"}},
-                {"$count": "total"}
-            ]
-            total_docs_result = list(self.collection.aggregate(total_docs_pipeline))
+            result = {
+                key: [item["_id"] for item in facet.get(key, []) if item["_id"]]
+                for key in ("categories", "source_types", "tags")
+            }
+            total_docs_result = facet.get("total_documents")
             result["total_documents"] = total_docs_result[0]["total"] if total_docs_result else 0
             
-            result["total_chunks"] = self.collection.count_documents({})
+            # Sin filtro: conteo desde la metadata de la colección (O(1), sin escanear)
+            result["total_chunks"] = await self.async_collection.estimated_document_count()
             
             logger.info(f"🎯 Retrieved filter values: {len(result['categories'])} categories, {len(result['tags'])} tags")
             return result
@@ -710,6 +1182,64 @@ class MongoRepository:
             logger.error(f"❌ get_filter_values error: {e}")
             return {}
     
+    async def ensure_indexes(self) -> None:
+        """Crear (si no existen) los índices de FRONT_INDEXES. Idempotente."""
+        for keys, options in FRONT_INDEXES:
+            try:
+                name = await self.async_collection.create_index(keys, **options)
+                logger.info(f"🗂️ Index ready: {name}")
+            except PyMongoError as e:
+                # Ej: ya existe otro índice de texto (solo se permite uno por colección)
+                logger.warning(f"⚠️ Could not create index {keys}: {e}")
+        
+        try:
+            self._set_index_keys(_index_key_patterns(await self.async_collection.list_indexes().to_list(length=None)))
+        except PyMongoError as e:
+            logger.warning(f"⚠️ Could not list indexes: {e}")
+    
+    def _list_index_keys(self) -> frozenset:
+        """Patrones de los índices de la colección (vacío si no se pueden listar: sin hints)"""
+        try:
+            return _index_key_patterns(list(self.collection.list_indexes()))
+        except PyMongoError as e:
+            logger.warning(f"⚠️ Could not list indexes: {e}")
+            return frozenset()
+    
+    def _set_index_keys(self, index_keys: frozenset) -> None:
+        self.index_keys = index_keys
+        # Índice de texto (el que sea: solo se permite uno por colección)
+        self.has_text_index = any(direction == TEXT for key in index_keys for _, direction in key)
+    
+    def _hint_kwargs(self, match: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        kwargs de aggregate() con el hint de FRONT_HINTS para este $match ({} = decide el planner).
+        Solo si el índice existe: un hint a un índice inexistente falla con OperationFailure.
+        """
+        if not match or "$text" in match:  # $text usa su índice
+            return {}
+        hint = FRONT_HINTS.get(frozenset(match) - {"pk"})
+        if hint is None or tuple(hint) not in self.index_keys:
+            return {}
+        return {"hint": hint}
+    
+    def text_search_filter(self, search_text: str) -> Dict[str, Any]:
+        """
+        Condición de $match para search_text (título, contenido y tags).
+        Con índice de texto usa $text; sin él, $regex literal sin distinguir mayúsculas
+        (COLLSCAN, pero la búsqueda sigue funcionando en vez de fallar con OperationFailure).
+        """
+        if self.has_text_index:
+            return {"$text": {"$search": search_text}}
+        if not self._text_fallback_warned:
+            logger.warning("⚠️ No text index on the collection: search_text uses $regex (slow)")
+            self._text_fallback_warned = True
+        pattern = {"$regex": re.escape(search_text), "$options": "i"}
+        return {"$or": [
+            {"text": pattern},
+            {"metadata.article_metadata.title": pattern},
+            {"metadata.tags": pattern}
+        ]}
+    
     def health_check(self) -> bool:
         """Check de salud de la conexión"""
         try:
@@ -3,17 +3,28 @@
 NASA Biology RAG Service - Main FastAPI App
 """
 from fastapi import FastAPI
-from app.core.settings import settings
+from fastapi.responses import ORJSONResponse
+from app.core.settings import get_settings
 from app.core.security import setup_cors
 from app.api.routers import chat, diag, front
+from app.utils.http_client import get_http_client, close_http_client
+from app.utils.redis_cache import close_redis
+import asyncio
 import logging
 
+# Punto de entrada de la app: aquí sí se necesitan los settings al importar
+settings = get_settings()
+
 # Setup logging
 logging.basicConfig(
     level=settings.LOG_LEVEL,
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
 )
 
+# En producción no imprimir tracebacks de errores internos del logging
+if settings.ENVIRONMENT == "production":
+    logging.raiseExceptions = False
+
 logger = logging.getLogger(__name__)
 
 # Create FastAPI app
@@ -23,6 +34,7 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    default_response_class=ORJSONResponse,  # orjson (C) en lugar de json stdlib
 )
 
 # Setup CORS
@@ -36,6 +48,65 @@ app.include_router(front.router)
 logger.info(f"🚀 NASA RAG initialized - Backend: {settings.VECTOR_BACKEND}")
 
 
+# Tareas en background del proceso (se cancelan en shutdown)
+_background_tasks: list[asyncio.Task] = []
+
+
+async def _refresh_filter_values_periodically(repo, interval: int) -> None:
+    """
+    Recalcular la vista materializada de /filters y /stats cada `interval` segundos.
+    Todos los workers corren este loop, pero un lease en MongoDB deja recalcular a uno
+    solo por intervalo; la versión solo cambia si los valores cambiaron.
+    """
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            # Lease un poco más corto que el intervalo: la siguiente vuelta puede tomarlo
+            if await repo.try_acquire_refresh_lease(max(interval - 5, 1)):
+                await repo.refresh_filter_values()
+        except Exception as e:
+            logger.warning(f"⚠️ Filter values refresh failed: {e}")
+
+
+@app.on_event("startup")
+async def warmup():
+    """
+    Inicializa los singletons (repo MongoDB, embeddings, pipelines) al arrancar,
+    para que el primer request no pague el cold start.
+    """
+    from app.services.rag.pipeline_advanced import get_rag_pipeline
+    from app.db.mongo_repo import get_mongo_repo
+    
+    try:
+        # Un único MongoClient + AsyncIOMotorClient por proceso (pool compartido)
+        repo = await asyncio.to_thread(get_mongo_repo)
+        app.state.repo = repo  # Inyectado en los endpoints por api.dependencies.repo_dep
+        if settings.MONGODB_ENSURE_INDEXES:
+            await repo.ensure_indexes()
+        if settings.FRONT_FILTERS_REFRESH_INTERVAL > 0:
+            _background_tasks.append(asyncio.create_task(
+                _refresh_filter_values_periodically(repo, settings.FRONT_FILTERS_REFRESH_INTERVAL)
+            ))
+        await asyncio.to_thread(get_rag_pipeline)
+        logger.info("✅ RAG pipelines warmed up")
+    except Exception as e:
+        # No bloquear el arranque: /diag/health reporta el estado degradado
+        logger.warning(f"⚠️ Pipeline warmup failed, will retry lazily: {e}")
+    
+    # Abrir el cliente HTTP compartido (keep-alive hacia OpenAI)
+    get_http_client()
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    """Cancelar tareas en background y cerrar los clientes compartidos (HTTP, Redis)"""
+    for task in _background_tasks:
+        task.cancel()
+    _background_tasks.clear()
+    await close_http_client()
+    await close_redis()
+
+
 @app.get("/")
 async def root():
     """Root endpoint"""
@@ -54,4 +125,18 @@ async def health():
     return {
         "status": "ok",
         "service": "nasa-rag",
-    }
\ No newline at end of file
+    }
+
+
+if __name__ == "__main__":
+    import sys
+    import uvicorn
+    
+    # uvloop + httptools (uvicorn[standard]); uvloop no está disponible en Windows
+    uvicorn.run(
+        "app.main:app",
+        host="0.0.0.0",
+        port=8000,
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools",
+    )
@@ -2,10 +2,22 @@
 NASA Biology RAG - Chat Schema
 Request/Response para endpoint de chat.
 """
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 from typing import Optional, List
 
 
+# Tabla de traducción precompilada: elimina caracteres de control (C0/C1)
+# excepto tab/newline. Lineal en el largo del input, sin regex ni backtracking.
+_QUERY_CONTROL_CHARS = str.maketrans(
+    "", "", "".join(chr(c) for c in [*range(0x00, 0x20), *range(0x7F, 0xA0)] if chr(c) not in "\t\n")
+)
+
+
+def sanitize_query(query: str) -> str:
+    """Quitar caracteres de control y espacios extremos de la query"""
+    return query.translate(_QUERY_CONTROL_CHARS).strip()
+
+
 class FilterFacets(BaseModel):
     """Filtros facetados para retrieval"""
     organism: Optional[List[str]] = None
@@ -83,6 +95,12 @@ class ChatRequest(BaseModel):
     top_k: int = Field(default=8, ge=1, le=20, description="Número de chunks a recuperar")
     session_id: Optional[str] = None
     
+    @field_validator("query", mode="before")
+    @classmethod
+    def _sanitize_query(cls, value):
+        # Antes de min_length: una query de solo espacios/controles se rechaza
+        return sanitize_query(value) if isinstance(value, str) else value
+    
     class Config:
         json_schema_extra = {
             "example": {
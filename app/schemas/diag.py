@@ -3,7 +3,7 @@ NASA Biology RAG - Diagnostic Schema
 Modelos para endpoints de diagnóstico.
 """
 from pydantic import BaseModel, Field
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Literal, Union
 
 
 class HealthResponse(BaseModel):
@@ -14,6 +14,8 @@ class HealthResponse(BaseModel):
     models: Dict[str, str]
     nasa_mode: bool
     guided_enabled: bool
+    cache: Optional[Dict[str, Any]] = None  # hit/miss del semantic cache
+    mongo_pool: Optional[Dict[str, int]] = None  # conexiones del pool async (Motor)
 
 
 class EmbeddingRequest(BaseModel):
@@ -24,9 +26,17 @@ class EmbeddingRequest(BaseModel):
 class EmbeddingResponse(BaseModel):
     """Response de POST /diag/emb"""
     text: str
-    embedding: List[float]
+    embedding: Union[List[int], List[float]] = Field(
+        ...,
+        description=(
+            "fp32/fp16: valores float. "
+            "int8: enteros en [-127, 127]; valor original ≈ embedding[i] * scale"
+        ),
+    )
     model: str
     dimensions: int
+    precision: Literal["fp32", "fp16", "int8"] = "fp32"
+    scale: Optional[float] = Field(None, description="Factor de escala (solo precision=int8)")
 
 
 class RetrievalRequest(BaseModel):
@@ -76,6 +86,7 @@ class AuditResult(BaseModel):
 
 class AuditResponse(BaseModel):
     """Response de POST /diag/retrieval_audit"""
+    run_id: Optional[str] = None  # Para reanudar con ?resume=<run_id>
     queries: List[AuditResult]
     avg_recall: float
     avg_precision: float
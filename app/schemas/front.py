@@ -2,12 +2,17 @@
 Schemas para endpoints del frontend - Adaptados a la estructura real de MongoDB
 """
 from typing import Optional, List, Dict, Any
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from datetime import datetime
 
+# Los endpoints del frontend construyen estos modelos con model_construct (schemas/front_builders.py)
+# desde proyecciones de MongoDB que ya traen las claves del schema: no hay alias ni validadores.
+
 
 class ArticleMetadata(BaseModel):
     """Metadatos del artículo desde metadata.article_metadata"""
+    model_config = ConfigDict(extra="ignore", frozen=True)
+    
     url: Optional[str] = None
     title: Optional[str] = None  # Puede ser None
     authors: List[str] = []
@@ -18,9 +23,11 @@ class ArticleMetadata(BaseModel):
 
 
 class DocumentMetadata(BaseModel):
-    """Metadatos de un documento/paper"""
+    """Metadatos de un documento/paper (PAPER_LIST_PROJECTION / DOCUMENT_META_PROJECTION)"""
+    model_config = ConfigDict(extra="ignore", frozen=True)
+    
     pk: str  # ID del documento (ej: mice-in-bion-m-1-space-mission)
-    title: Optional[str] = None  # Título del documento (puede venir de article_metadata.title)
+    title: Optional[str] = None  # Título del documento (sale de article_metadata.title)
     source_type: Optional[str] = None  # article, etc
     source_url: Optional[str] = None
     category: Optional[str] = None  # space, etc
@@ -30,8 +37,10 @@ class DocumentMetadata(BaseModel):
 
 
 class DocumentChunk(BaseModel):
-    """Chunk individual de MongoDB (sin agrupar)"""
-    id: str  # _id de MongoDB convertido a string
+    """Chunk individual de MongoDB (sin agrupar), con metadata.* aplanado por CHUNK_DETAIL_PROJECTION"""
+    model_config = ConfigDict(extra="ignore", frozen=True)
+    
+    id: str  # _id de MongoDB convertido a string ($toString)
     pk: str
     text: str
     source_type: Optional[str] = None
@@ -48,11 +57,12 @@ class DocumentChunk(BaseModel):
 
 class DocumentListResponse(BaseModel):
     """Respuesta con lista de papers únicos"""
-    total: int
+    total: Optional[int] = None  # None con count_mode=none
     documents: List[DocumentMetadata]  # Papers únicos (1 por pk)
     page: Optional[int] = None
     page_size: Optional[int] = None
     total_pages: Optional[int] = None
+    next_cursor: Optional[str] = None  # pk del último documento (usar como ?after= en la siguiente página)
 
 
 class ChunksListResponse(BaseModel):
@@ -80,7 +90,7 @@ class FilterValuesResponse(BaseModel):
 
 
 class DocumentDetailResponse(BaseModel):
-    """Detalle completo de un documento con todos sus chunks"""
+    """Detalle de un documento con la primera página de sus chunks (total en total_chunks)"""
     metadata: DocumentMetadata
     chunks: List[DocumentChunk]
     total_chunks: int
@@ -0,0 +1,45 @@
+"""
+Builders para los schemas del frontend: convierten documentos de MongoDB en
+DocumentMetadata / DocumentChunk.
+Los documentos ya llegan con las claves del schema (PAPER_LIST_PROJECTION,
+DOCUMENT_META_PROJECTION, CHUNK_DETAIL_PROJECTION en db/mongo_repo.py) y vienen
+de nuestra propia base, así que se construyen con model_construct (sin validar).
+Los dicts son los recién decodificados por el driver: se reutilizan (se reemplaza
+article_metadata en el mismo dict) en vez de copiarlos por documento.
+"""
+from typing import Any, Dict, Iterable, List, Optional
+from app.schemas.front import ArticleMetadata, DocumentMetadata, DocumentChunk
+
+
+def _build_article(article_metadata: Optional[Dict[str, Any]]) -> Optional[ArticleMetadata]:
+    return ArticleMetadata.model_construct(**article_metadata) if article_metadata else None
+
+
+def build_meta(doc: Dict[str, Any]) -> DocumentMetadata:
+    """Un paper (PAPER_LIST_PROJECTION / DOCUMENT_META_PROJECTION) -> DocumentMetadata"""
+    doc["article_metadata"] = _build_article(doc.get("article_metadata"))
+    return DocumentMetadata.model_construct(**doc)
+
+
+def build_metas(docs: Iterable[Dict[str, Any]]) -> List[DocumentMetadata]:
+    """Página de papers -> List[DocumentMetadata]"""
+    return [build_meta(doc) for doc in docs]
+
+
+def build_chunks(
+    chunks: Iterable[Dict[str, Any]],
+    article_metadata: Optional[ArticleMetadata] = None,
+) -> List[DocumentChunk]:
+    """
+    Chunks (CHUNK_DETAIL_PROJECTION) -> List[DocumentChunk].
+    Con `article_metadata` (chunks de un mismo documento, CHUNK_BODY_PROJECTION)
+    todos los chunks comparten esa instancia en vez de construir una por chunk.
+    """
+    if article_metadata is not None:
+        return [DocumentChunk.model_construct(**chunk, article_metadata=article_metadata) for chunk in chunks]
+    
+    chunk_list = []
+    for chunk in chunks:
+        chunk["article_metadata"] = _build_article(chunk.get("article_metadata"))
+        chunk_list.append(DocumentChunk.model_construct(**chunk))
+    return chunk_list
@@ -2,11 +2,11 @@
 NASA Biology RAG - OpenAI Embeddings
 Generador de embeddings usando OpenAI text-embedding-3-small (1536 dimensiones).
 """
-from openai import OpenAI
+from openai import OpenAI, AsyncOpenAI
 from typing import List, Union
 import numpy as np
 import logging
-from app.core.settings import settings
+from app.core.settings import get_settings
 
 logger = logging.getLogger(__name__)
 
@@ -26,12 +26,14 @@ class OpenAIEmbeddings:
         Args:
             model_name: Modelo de OpenAI (text-embedding-3-small o text-embedding-3-large)
         """
+        settings = get_settings()
         logger.info(f"🔄 Initializing OpenAI embeddings: {model_name}...")
         
         if not settings.OPENAI_API_KEY:
             raise ValueError("❌ OPENAI_API_KEY no está configurado en .env")
         
         self.client = OpenAI(api_key=settings.OPENAI_API_KEY)
+        self.async_client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)  # para el event loop de FastAPI
         self.model_name = model_name
         
         # Dimensiones según modelo
@@ -88,6 +90,59 @@ class OpenAIEmbeddings:
         
         return embeddings_list[0] if is_single else embeddings_list
     
+    async def aencode(
+        self,
+        texts: Union[str, List[str]],
+        batch_size: int = 100,
+    ) -> Union[List[float], List[List[float]]]:
+        """
+        Versión async de `encode` (AsyncOpenAI): no bloquea el event loop
+        durante el round-trip al API.
+        
+        Args:
+            texts: Texto o lista de textos
+            batch_size: Batch size para procesar múltiples textos
+        
+        Returns:
+            Vector o lista de vectores (1536 dims cada uno)
+        """
+        is_single = isinstance(texts, str)
+        if is_single:
+            texts = [texts]
+        
+        embeddings_list = []
+        
+        for i in range(0, len(texts), batch_size):
+            batch = texts[i:i + batch_size]
+            
+            try:
+                response = await self.async_client.embeddings.create(
+                    input=batch,
+                    model=self.model_name
+                )
+                embeddings_list.extend(item.embedding for item in response.data)
+                
+            except Exception as e:
+                logger.error(f"❌ Error generating embeddings: {e}")
+                raise
+        
+        return embeddings_list[0] if is_single else embeddings_list
+    
+    async def aencode_query(self, query: str) -> List[float]:
+        """
+        Versión async de `encode_query`.
+        
+        Args:
+            query: Query del usuario
+        
+        Returns:
+            Vector de 1536 dimensiones
+        """
+        logger.info(f"🔍 Encoding query: {query[:100]}...")
+        embedding = await self.aencode(query)
+        logger.info(f"✅ Query encoded: {len(embedding)} dims")
+        return embedding
+    
     def encode_query(self, query: str) -> List[float]:
         """
         Genera embedding para una query de búsqueda.
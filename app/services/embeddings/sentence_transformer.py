@@ -4,6 +4,7 @@ Generador de embeddings usando all-MiniLM-L6-v2 (384 dimensiones).
 """
 from sentence_transformers import SentenceTransformer
 from typing import List, Union
+import asyncio
 import numpy as np
 import logging
 
@@ -76,6 +77,22 @@ class SentenceTransformerEmbeddings:
         """
         return self.encode(query, normalize=True)
     
+    async def aencode(
+        self,
+        texts: Union[str, List[str]],
+        normalize: bool = True,
+        batch_size: int = 32,
+    ) -> Union[List[float], List[List[float]]]:
+        """
+        Versión async de `encode`: corre el modelo en un thread para no
+        bloquear el event loop (misma interfaz que OpenAIEmbeddings).
+        """
+        return await asyncio.to_thread(self.encode, texts, normalize, batch_size)
+    
+    async def aencode_query(self, query: str) -> List[float]:
+        """Versión async de `encode_query`"""
+        return await self.aencode(query, normalize=True)
+    
     def encode_documents(self, documents: List[str], batch_size: int = 32) -> List[List[float]]:
         """
         Genera embeddings para múltiples documentos (útil para indexación).
@@ -4,15 +4,16 @@ Orquesta retrieval + context building + LLM synthesis.
 """
 from typing import Optional, Dict, Any
 from time import time
-import httpx
 from app.schemas.chat import FilterFacets, ChatResponse, Citation, RetrievalMetrics
 from app.services.rag.repository import get_repository_service
 from app.services.rag.retriever import Retriever
 from app.services.rag.context_builder import ContextBuilder
 from app.services.rag.prompts.free_nasa import SYNTHESIS_PROMPT
 from app.services.embeddings import get_embeddings_service  # Usa OpenAI embeddings (1536 dims)
-from app.core.settings import settings
+from app.core.settings import get_settings
+from app.utils.http_client import get_http_client
 from collections import Counter
+import asyncio
 import logging
 
 logger = logging.getLogger(__name__)
@@ -46,15 +47,15 @@ class RAGPipeline:
         """
         start_time = time()
         
-        # 1. Embedding (síncrono, muy rápido en CPU)
+        # 1. Embedding
         logger.info(f"🔍 Query: {query[:100]}...")
-        query_vec = self._get_embedding(query)
+        query_vec = await self._get_embedding(query)
         
         # 1.5. Auto-extract tags from query and merge with existing filters
         enhanced_filters = self._enhance_filters_with_query_tags(query, filters)
         
         # 2. Retrieval
-        chunks = self.retriever.retrieve(query_vec, enhanced_filters, top_k)
+        chunks = await asyncio.to_thread(self.retriever.retrieve, query_vec, enhanced_filters, top_k)
         if not chunks:
             return self._empty_response(query, enhanced_filters, session_id)
         
@@ -95,16 +96,25 @@ class RAGPipeline:
             session_id=session_id,
         )
     
-    def _get_embedding(self, text: str) -> list[float]:
+    async def _get_embedding(self, text: str) -> list[float]:
         """
-        Generar embedding usando sentence-transformers (all-MiniLM-L6-v2).
-        Retorna vector de 384 dimensiones con similitud de coseno.
-        Muy rápido: ~14,000 oraciones/seg en CPU.
+        Generar embedding de la query con el servicio de embeddings (async:
+        cede el event loop durante el round-trip a OpenAI).
         """
-        return self.embeddings.encode_query(text)
+        return await self.embeddings.aencode_query(text)
+    
+    async def _get_embeddings_batch(self, texts: list[str]) -> list[list[float]]:
+        """
+        Generar embeddings para varias queries en una sola llamada al API
+        (OpenAI /v1/embeddings acepta `input` como lista).
+        """
+        if not texts:
+            return []
+        return await self.embeddings.aencode(texts)
     
     async def _synthesize(self, query: str, context: str) -> str:
         """Síntesis con OpenAI chat"""
+        settings = get_settings()
         url = "https://api.openai.com/v1/chat/completions"
         headers = {
             "Authorization": f"Bearer {settings.OPENAI_API_KEY}",
@@ -123,11 +133,10 @@ class RAGPipeline:
             "max_tokens": settings.OPENAI_MAX_TOKENS,
         }
         
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            response = await client.post(url, headers=headers, json=payload)
-            response.raise_for_status()
-            data = response.json()
-            return data["choices"][0]["message"]["content"]
+        response = await get_http_client().post(url, headers=headers, json=payload)
+        response.raise_for_status()
+        data = response.json()
+        return data["choices"][0]["message"]["content"]
     
     def _extract_title_from_text(self, text: str) -> Optional[str]:
         """Extract title from text content - usually the first line or after 'Title:'"""
@@ -11,9 +11,10 @@ Características:
 - Métricas de calidad (faithfulness, relevancy, grounding)
 """
 
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple, AsyncIterator
 from time import time
-import httpx
+import asyncio
+import json
 import re
 from collections import Counter
 
@@ -24,8 +25,10 @@ from app.services.rag.context_builder import ContextBuilder
 from app.services.rag.prompts.free_nasa import SYNTHESIS_PROMPT
 from app.services.rag.tag_dict import get_expanded_terms, get_matched_keys, expand_query_text
 from app.services.rag.reranker import AdvancedReranker
+from app.services.rag.semantic_cache import get_semantic_cache
 from app.services.embeddings import get_embeddings_service
-from app.core.settings import settings
+from app.core.settings import get_settings
+from app.utils.http_client import get_http_client
 
 # === Advanced RAG v2.0 Components ===
 from app.services.rag.bm25_retriever import BM25Retriever, get_bm25_retriever, init_bm25_retriever
@@ -36,6 +39,8 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+OPENAI_CHAT_URL = "https://api.openai.com/v1/chat/completions"
+
 
 class RAGPipeline:
     """Pipeline completo de RAG con expansión de query y reranking avanzado"""
@@ -69,6 +74,7 @@ class RAGPipeline:
         filters: Optional[FilterFacets] = None,
         top_k: int = 8,
         session_id: Optional[str] = None,
+        use_cache: bool = True,
     ) -> ChatResponse:
         """
         Proceso completo de RAG avanzado:
@@ -84,12 +90,106 @@ class RAGPipeline:
         """
         start_time = time()
         
+        # FASE 1-2: Query expansion + embedding
+        query_expanded, expanded_terms = self._expand_query(query)
+        query_vec = await self._get_embedding(query_expanded)
+        
+        # Semantic cache: queries equivalentes reutilizan la respuesta previa
+        cache_namespace = self._cache_namespace(filters, top_k)
+        use_cache = use_cache and get_settings().SEMANTIC_CACHE_ENABLED
+        if use_cache:
+            cached = self._get_cached(query_vec, cache_namespace, session_id, start_time)
+            if cached is not None:
+                return cached
+        
+        # FASE 3-5: Retrieval híbrido + reranking + contexto
+        chunks, reranked_chunks = await self._retrieve_and_rerank(
+            query, query_expanded, query_vec, filters, top_k, expanded_terms
+        )
+        if not chunks:
+            return self._empty_response(query, filters, session_id)
+        
+        context = self.context_builder.build_context(reranked_chunks)
+        
         # ===========================================================================
-        # FASE 1: QUERY EXPANSION
+        # FASE 6: LLM SYNTHESIS (con citas estrictas)
         # ===========================================================================
+        logger.info("🤖 Generating answer with strict citations...")
+        answer = await self._synthesize(query, context)
+        
+        # FASE 7-8: Citations + metrics
+        response = self._build_response(answer, chunks, reranked_chunks, start_time, session_id)
+        
+        if use_cache:
+            get_semantic_cache().set(query_vec, response, namespace=cache_namespace)
+        
+        return response
+    
+    async def answer_stream(
+        self,
+        query: str,
+        filters: Optional[FilterFacets] = None,
+        top_k: int = 8,
+        session_id: Optional[str] = None,
+        use_cache: bool = True,
+    ) -> AsyncIterator[str]:
+        """
+        Igual que `answer` pero emite la respuesta como Server-Sent Events:
+        
+        - `data: {"delta": "..."}` por cada fragmento generado por el LLM
+        - `event: done` + `data: <ChatResponse JSON>` al final (citas y métricas)
+        """
+        start_time = time()
+        
+        query_expanded, expanded_terms = self._expand_query(query)
+        query_vec = await self._get_embedding(query_expanded)
+        
+        cache_namespace = self._cache_namespace(filters, top_k)
+        use_cache = use_cache and get_settings().SEMANTIC_CACHE_ENABLED
+        if use_cache:
+            cached = self._get_cached(query_vec, cache_namespace, session_id, start_time)
+            if cached is not None:
+                yield self._sse({"delta": cached.answer})
+                yield self._sse(cached.model_dump(mode="json"), event="done")
+                return
+        
+        chunks, reranked_chunks = await self._retrieve_and_rerank(
+            query, query_expanded, query_vec, filters, top_k, expanded_terms
+        )
+        if not chunks:
+            empty = self._empty_response(query, filters, session_id)
+            yield self._sse({"delta": empty.answer})
+            yield self._sse(empty.model_dump(mode="json"), event="done")
+            return
+        
+        context = self.context_builder.build_context(reranked_chunks)
+        
+        logger.info("🤖 Streaming answer with strict citations...")
+        parts = []
+        async for delta in self._synthesize_stream(query, context):
+            parts.append(delta)
+            yield self._sse({"delta": delta})
+        
+        response = self._build_response("".join(parts), chunks, reranked_chunks, start_time, session_id)
+        
+        if use_cache:
+            get_semantic_cache().set(query_vec, response, namespace=cache_namespace)
+        
+        yield self._sse(response.model_dump(mode="json"), event="done")
+    
+    @staticmethod
+    def _sse(data: Dict[str, Any], event: Optional[str] = None) -> str:
+        """Formatear un frame Server-Sent Events"""
+        frame = f"event: {event}\n" if event else ""
+        return f"{frame}data: {json.dumps(data, ensure_ascii=False)}\n\n"
+    
+    def _expand_query(self, query: str) -> Tuple[str, List[str]]:
+        """
+        FASE 1: QUERY EXPANSION
+        Detecta términos del TAG_DICT y construye la query expandida (para embedding).
+        """
         logger.info(f"🔍 Original query: {query[:100]}...")
         
-        # Detectar términos del TAG_DICT en la query
         matched_keys = get_matched_keys(query)
         expanded_terms = get_expanded_terms(query)
         
@@ -97,14 +197,38 @@ class RAGPipeline:
             logger.info(f"🏷️  TAG_DICT matches: {matched_keys}")
             logger.info(f"📝 Expanded terms: {list(expanded_terms)[:10]}...")  # Primeros 10
         
-        # Construir query expandida (para embedding)
-        query_expanded = expand_query_text(query)
-        
-        # ===========================================================================
-        # FASE 2: EMBEDDING
-        # ===========================================================================
-        query_vec = self._get_embedding(query_expanded)
-        
+        return expand_query_text(query), expanded_terms
+    
+    def _get_cached(
+        self,
+        query_vec: List[float],
+        namespace: str,
+        session_id: Optional[str],
+        start_time: float,
+    ) -> Optional[ChatResponse]:
+        """Respuesta del semantic cache con session_id y latencia del request actual"""
+        cached = get_semantic_cache().get(query_vec, namespace=namespace)
+        if cached is None:
+            return None
+        latency_ms = (time() - start_time) * 1000
+        return cached.model_copy(update={
+            "session_id": session_id,
+            "metrics": cached.metrics.model_copy(update={"latency_ms": round(latency_ms, 2)}),
+        })
+    
+    async def _retrieve_and_rerank(
+        self,
+        query: str,
+        query_expanded: str,
+        query_vec: List[float],
+        filters: Optional[FilterFacets],
+        top_k: int,
+        expanded_terms: List[str],
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        FASE 3-4: retrieval híbrido + reranking.
+        Retorna (candidatos, chunks rerankeados para síntesis).
+        """
         # ===========================================================================
         # FASE 3: HYBRID RETRIEVAL (Dense + BM25 + RRF Fusion)
         # ===========================================================================
@@ -121,11 +245,12 @@ class RAGPipeline:
         else:
             # Fallback: Dense retrieval only
             retrieval_k = self.TOP_K if self.TOP_K > top_k else top_k * 3
-            chunks = self.retriever.retrieve(query_vec, filters, retrieval_k)
+            # PyMongo es síncrono: el vector search corre en un thread para no bloquear el event loop
+            chunks = await asyncio.to_thread(self.retriever.retrieve, query_vec, filters, retrieval_k)
             logger.info(f"📚 Dense retrieval: {len(chunks)} initial candidates")
         
         if not chunks:
-            return self._empty_response(query, filters, session_id)
+            return [], []
         
         # ===========================================================================
         # FASE 4: ADVANCED RERANKING (Cross-Encoder or Custom)
@@ -156,25 +281,19 @@ class RAGPipeline:
             reranked_chunks = reranker.rerank(chunks)
             logger.info(f"🔄 Custom reranked to {len(reranked_chunks)} chunks for synthesis")
         
-        # ===========================================================================
-        # FASE 5: CONTEXT BUILDING
-        # ===========================================================================
-        context = self.context_builder.build_context(reranked_chunks)
-        
-        # ===========================================================================
-        # FASE 6: LLM SYNTHESIS (con citas estrictas)
-        # ===========================================================================
-        logger.info("🤖 Generating answer with strict citations...")
-        answer = await self._synthesize(query, context)
-        
-        # ===========================================================================
-        # FASE 7: CITATIONS
-        # ===========================================================================
+        return chunks, reranked_chunks
+    
+    def _build_response(
+        self,
+        answer: str,
+        chunks: List[Dict[str, Any]],
+        reranked_chunks: List[Dict[str, Any]],
+        start_time: float,
+        session_id: Optional[str],
+    ) -> ChatResponse:
+        """FASE 7-8: citations + métricas + response"""
         citations = self._extract_citations(reranked_chunks)
         
-        # ===========================================================================
-        # FASE 8: METRICS
-        # ===========================================================================
         # Calculate grounding ratio (% de claims con citas)
         grounded_ratio = self._estimate_grounding(answer, citations)
         
@@ -191,9 +310,6 @@ class RAGPipeline:
         
         logger.info(f"✅ Pipeline completed in {latency_ms:.0f}ms (grounding: {grounded_ratio:.1%})")
         
-        # ===========================================================================
-        # RESPONSE
-        # ===========================================================================
         return ChatResponse(
             answer=answer,
             citations=citations,
@@ -201,6 +317,12 @@ class RAGPipeline:
             session_id=session_id,
         )
     
+    @staticmethod
+    def _cache_namespace(filters: Optional[FilterFacets], top_k: int) -> str:
+        """Namespace del semantic cache: solo se comparten respuestas con mismos filtros/top_k"""
+        filters_key = filters.model_dump_json(exclude_none=True) if filters else ""
+        return f"chat:{top_k}:{filters_key}"
+    
     async def _retrieve_hybrid(
         self,
         query: str,
@@ -217,23 +339,27 @@ class RAGPipeline:
         2. BM25 retrieval (lexical) → top 25
         3. RRF fusion → top 24 for reranking
         """
-        # 1. Dense retrieval
-        dense_chunks = self.retriever.retrieve(query_vec, filters, self.TOP_K_DENSE)
-        logger.info(f"  📊 Dense: {len(dense_chunks)} chunks")
-        
-        # 2. BM25 retrieval
+        # 1 + 2. Dense (vector search en MongoDB) y BM25 (en memoria) en paralelo:
+        # el scoring BM25 corre mientras se espera la respuesta de Atlas
         bm25_retriever = get_bm25_retriever()
+        dense_task = asyncio.to_thread(self.retriever.retrieve, query_vec, filters, self.TOP_K_DENSE)
         if bm25_retriever:
-            bm25_chunks = bm25_retriever.search(
-                query=query,
-                expanded_terms=expanded_terms,
-                top_k=self.TOP_K_BM25,
-                boost_expanded=0.5
+            dense_chunks, bm25_chunks = await asyncio.gather(
+                dense_task,
+                asyncio.to_thread(
+                    bm25_retriever.search,
+                    query=query,
+                    expanded_terms=expanded_terms,
+                    top_k=self.TOP_K_BM25,
+                    boost_expanded=0.5
+                ),
             )
-            logger.info(f"  📊 BM25: {len(bm25_chunks)} chunks")
+            logger.info(f"  📊 Dense: {len(dense_chunks)} chunks | BM25: {len(bm25_chunks)} chunks")
         else:
             logger.warning("⚠️  BM25 retriever not initialized, using dense only")
+            dense_chunks = await dense_task
             bm25_chunks = []
+            logger.info(f"  📊 Dense: {len(dense_chunks)} chunks")
         
         # 3. RRF Fusion
         if bm25_chunks:
@@ -249,24 +375,64 @@ class RAGPipeline:
             # Fallback to dense only
             return dense_chunks[:self.TOP_K_RRF]
     
-    def _get_embedding(self, text: str) -> List[float]:
+    async def _get_embedding(self, text: str) -> List[float]:
         """Generar embedding con OpenAI text-embedding-3-small (1536 dims)"""
-        return self.embeddings.encode_query(text)
+        return await self.embeddings.aencode_query(text)
+    
+    async def _get_embeddings_batch(self, texts: List[str]) -> List[List[float]]:
+        """Generar embeddings de varias queries en una sola llamada a OpenAI"""
+        if not texts:
+            return []
+        return await self.embeddings.aencode(texts)
     
     async def _synthesize(self, query: str, context: str) -> str:
         """
         Síntesis con OpenAI usando el SYNTHESIS_PROMPT estricto.
         El prompt enforcea citas obligatorias y faithfulness.
         """
-        url = "https://api.openai.com/v1/chat/completions"
-        headers = {
-            "Authorization": f"Bearer {settings.OPENAI_API_KEY}",
+        response = await get_http_client().post(
+            OPENAI_CHAT_URL,
+            headers=self._openai_headers(),
+            json=self._synthesis_payload(query, context),
+        )
+        response.raise_for_status()
+        data = response.json()
+        return data["choices"][0]["message"]["content"]
+    
+    async def _synthesize_stream(self, query: str, context: str) -> AsyncIterator[str]:
+        """Síntesis en modo streaming: emite los fragmentos de texto a medida que llegan"""
+        payload = self._synthesis_payload(query, context)
+        payload["stream"] = True
+        
+        async with get_http_client().stream(
+            "POST", OPENAI_CHAT_URL, headers=self._openai_headers(), json=payload
+        ) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if not line.startswith("data: "):
+                    continue
+                data = line[len("data: "):]
+                if data == "[DONE]":
+                    break
+                choices = json.loads(data).get("choices") or []
+                delta = choices[0].get("delta", {}).get("content") if choices else None
+                if delta:
+                    yield delta
+    
+    @staticmethod
+    def _openai_headers() -> Dict[str, str]:
+        return {
+            "Authorization": f"Bearer {get_settings().OPENAI_API_KEY}",
             "Content-Type": "application/json",
         }
-        
+    
+    @staticmethod
+    def _synthesis_payload(query: str, context: str) -> Dict[str, Any]:
+        """Payload de chat completions con el SYNTHESIS_PROMPT estricto"""
+        settings = get_settings()
         prompt = SYNTHESIS_PROMPT.format(context=context, query=query)
         
-        payload = {
+        return {
             "model": settings.OPENAI_CHAT_MODEL,
             "messages": [
                 {
@@ -283,12 +449,6 @@ class RAGPipeline:
             "temperature": settings.OPENAI_TEMPERATURE,
             "max_tokens": settings.OPENAI_MAX_TOKENS,
         }
-        
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            response = await client.post(url, headers=headers, json=payload)
-            response.raise_for_status()
-            data = response.json()
-            return data["choices"][0]["message"]["content"]
     
     def _extract_citations(self, chunks: List[Dict[str, Any]]) -> List[Citation]:
         """
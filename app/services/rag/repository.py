@@ -3,7 +3,7 @@ NASA Biology RAG - Repository (orquestador)
 Orquesta consultas al repo de datos (Cosmos o pgvector).
 """
 from typing import List, Dict, Any, Optional
-from app.core.settings import settings
+from app.core.settings import get_settings
 import logging
 
 logger = logging.getLogger(__name__)
@@ -13,7 +13,7 @@ class RepositoryService:
     """Orquestador de repositorios"""
     
     def __init__(self):
-        self.backend = settings.VECTOR_BACKEND
+        self.backend = get_settings().VECTOR_BACKEND
         self._repo = None
     
     @property
@@ -5,7 +5,7 @@ Búsqueda híbrida con ponderación por sección y dedup.
 from typing import List, Dict, Any, Optional
 from app.schemas.chat import FilterFacets
 from app.core.constants import SECTION_PRIORITY
-from app.core.settings import settings
+from app.core.settings import get_settings
 import logging
 
 logger = logging.getLogger(__name__)
@@ -22,6 +22,7 @@ class Retriever:
         query_vec: List[float],
         filters: Optional[FilterFacets] = None,
         top_k: int = 8,
+        text_limit: Optional[int] = None,
     ) -> List[Dict[str, Any]]:
         """
         Recuperar chunks con filtros y re-ranking por sección.
@@ -31,6 +32,9 @@ class Retriever:
         2. Re-ranking por prioridad de sección (Results > Conclusion > Methods > Intro)
         3. Dedup por DOI/source_id
         4. Return top_k
+        
+        text_limit: si se indica, MongoDB trunca `text` a ese número de caracteres
+        en la proyección (menos bytes transferidos).
         """
         # 1. Vector search
         filter_dict = self._filters_to_dict(filters) if filters else None
@@ -38,7 +42,8 @@ class Retriever:
             query_vec=query_vec,
             filters=filter_dict,
             top_k=top_k * 2,  # Obtener más para tener margen después de dedup
-            min_similarity=settings.MIN_SIMILARITY,
+            min_similarity=get_settings().MIN_SIMILARITY,
+            text_limit=text_limit,
         )
         
         if not chunks:
@@ -0,0 +1,184 @@
+"""
+NASA Biology RAG - Semantic Cache
+Cache semántico de respuestas indexado por LSH (random hyperplanes) sobre el
+embedding de la query. Queries idénticas o parafraseadas (coseno >= threshold)
+reutilizan la respuesta previa sin re-ejecutar retrieval ni síntesis.
+"""
+from typing import Any, Dict, List, Optional, Tuple
+from collections import OrderedDict
+from dataclasses import dataclass
+from time import monotonic
+import threading
+import numpy as np
+from app.core.settings import get_settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _CacheEntry:
+    namespace: str
+    vector: np.ndarray  # vector normalizado (norma 1)
+    value: Any
+    expires_at: float
+    signatures: List[int]
+
+
+class SemanticCache:
+    """
+    Cache LSH en memoria con TTL y evicción LRU.
+
+    - num_bits: bits por firma (hiperplanos por tabla)
+    - num_tables: tablas hash independientes (más tablas = mejor recall)
+    - threshold: similitud coseno mínima para considerar un hit
+    """
+
+    def __init__(
+        self,
+        num_bits: int = 16,
+        num_tables: int = 4,
+        threshold: float = 0.95,
+        ttl_seconds: int = 600,
+        max_entries: int = 1024,
+        seed: int = 42,
+    ):
+        self.num_bits = num_bits
+        self.num_tables = num_tables
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._rng = np.random.default_rng(seed)
+        self._planes: Optional[np.ndarray] = None  # (num_tables, num_bits, dim)
+        self._bit_weights = 1 << np.arange(num_bits, dtype=np.int64)
+        self._tables: List[Dict[Tuple[str, int], set]] = [{} for _ in range(num_tables)]
+        self._entries: "OrderedDict[int, _CacheEntry]" = OrderedDict()
+        self._next_id = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _normalize(self, vec: List[float]) -> Optional[np.ndarray]:
+        """Normalizar vector y (re)inicializar hiperplanos si cambia la dimensión"""
+        arr = np.asarray(vec, dtype=np.float32)
+        norm = float(np.linalg.norm(arr))
+        if norm == 0.0:
+            return None
+        if self._planes is None or self._planes.shape[2] != arr.shape[0]:
+            # Nuevo modelo de embeddings: las firmas previas ya no son comparables
+            self._planes = self._rng.standard_normal(
+                (self.num_tables, self.num_bits, arr.shape[0])
+            ).astype(np.float32)
+            self._clear_locked()
+        return arr / norm
+
+    def _signatures(self, unit_vec: np.ndarray) -> List[int]:
+        """Firma LSH por tabla: signo de la proyección sobre cada hiperplano"""
+        bits = (self._planes @ unit_vec) > 0  # (num_tables, num_bits)
+        return [int(s) for s in (bits * self._bit_weights).sum(axis=1)]
+
+    def _remove_locked(self, entry_id: int) -> None:
+        entry = self._entries.pop(entry_id, None)
+        if entry is None:
+            return
+        for table, sig in zip(self._tables, entry.signatures):
+            bucket = table.get((entry.namespace, sig))
+            if bucket is not None:
+                bucket.discard(entry_id)
+                if not bucket:
+                    del table[(entry.namespace, sig)]
+
+    def _clear_locked(self) -> None:
+        self._entries.clear()
+        self._tables = [{} for _ in range(self.num_tables)]
+
+    def get(self, vec: List[float], namespace: str = "") -> Optional[Any]:
+        """Buscar una entrada semánticamente equivalente (mismo namespace)"""
+        with self._lock:
+            unit_vec = self._normalize(vec)
+            if unit_vec is None:
+                self.misses += 1
+                return None
+
+            now = monotonic()
+            candidates = set()
+            for table, sig in zip(self._tables, self._signatures(unit_vec)):
+                candidates.update(table.get((namespace, sig), ()))
+
+            best_id, best_sim = None, self.threshold
+            for entry_id in candidates:
+                entry = self._entries.get(entry_id)
+                if entry is None:
+                    continue
+                if entry.expires_at <= now:
+                    self._remove_locked(entry_id)
+                    continue
+                sim = float(entry.vector @ unit_vec)
+                if sim >= best_sim:
+                    best_id, best_sim = entry_id, sim
+
+            if best_id is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(best_id)
+            self.hits += 1
+            logger.info(f"⚡ Semantic cache hit (cos={best_sim:.4f}, ns={namespace})")
+            return self._entries[best_id].value
+
+    def set(self, vec: List[float], value: Any, namespace: str = "") -> None:
+        """Guardar una respuesta asociada al embedding de la query"""
+        with self._lock:
+            unit_vec = self._normalize(vec)
+            if unit_vec is None:
+                return
+
+            signatures = self._signatures(unit_vec)
+            entry_id = self._next_id
+            self._next_id += 1
+            self._entries[entry_id] = _CacheEntry(
+                namespace=namespace,
+                vector=unit_vec,
+                value=value,
+                expires_at=monotonic() + self.ttl_seconds,
+                signatures=signatures,
+            )
+            for table, sig in zip(self._tables, signatures):
+                table.setdefault((namespace, sig), set()).add(entry_id)
+
+            # Evicción LRU
+            while len(self._entries) > self.max_entries:
+                oldest_id = next(iter(self._entries))
+                self._remove_locked(oldest_id)
+
+    def clear(self) -> None:
+        """Vaciar el cache"""
+        with self._lock:
+            self._clear_locked()
+
+    def stats(self) -> Dict[str, Any]:
+        """Estadísticas de hit/miss (expuestas en /diag/health)"""
+        total = self.hits + self.misses
+        return {
+            "enabled": get_settings().SEMANTIC_CACHE_ENABLED,
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+        }
+
+
+# Singleton
+_semantic_cache: Optional[SemanticCache] = None
+
+def get_semantic_cache() -> SemanticCache:
+    """Get or create semantic cache"""
+    global _semantic_cache
+    settings = get_settings()
+    if _semantic_cache is None:
+        _semantic_cache = SemanticCache(
+            threshold=settings.SEMANTIC_CACHE_THRESHOLD,
+            ttl_seconds=settings.SEMANTIC_CACHE_TTL,
+            max_entries=settings.SEMANTIC_CACHE_MAX_ENTRIES,
+        )
+    return _semantic_cache
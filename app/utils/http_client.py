@@ -0,0 +1,38 @@
+"""
+NASA Biology RAG - HTTP Client
+Cliente httpx.AsyncClient compartido (keep-alive + pool de conexiones) para
+llamadas a OpenAI. Evita un handshake TCP+TLS nuevo en cada request.
+"""
+from typing import Optional
+import importlib.util
+import httpx
+import logging
+
+logger = logging.getLogger(__name__)
+
+# HTTP/2 solo si el paquete `h2` está instalado (httpx[http2])
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+# Singleton
+_http_client: Optional[httpx.AsyncClient] = None
+
+def get_http_client() -> httpx.AsyncClient:
+    """Get or create shared AsyncClient"""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            timeout=60.0,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+        )
+        logger.info(f"🌐 Shared HTTP client created (http2={HTTP2_AVAILABLE})")
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """Cerrar el cliente compartido (shutdown de la app)"""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
@@ -0,0 +1,111 @@
+"""
+NASA Biology RAG - Redis Cache
+Cache compartido entre workers para respuestas caras y poco cambiantes del
+frontend (/filters, /stats). Opcional: sin REDIS_URL o sin el paquete `redis`
+se usa un cache TTL + LRU en memoria por proceso (acotado) con la misma interfaz.
+"""
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+from time import monotonic
+import importlib.util
+import orjson
+from app.core.settings import get_settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+REDIS_AVAILABLE = importlib.util.find_spec("redis") is not None
+
+# Fallback en memoria (por proceso): key -> (expires_at monotonic, value), en orden LRU.
+# Acotado: las claves que no se vuelven a leer se barren al expirar o salen por LRU
+LOCAL_CACHE_MAX_ENTRIES = 1024
+_local_cache: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+
+
+def _local_set(key: str, value: Any, ttl: int) -> None:
+    """SET EX en el fallback local: barre expirados y desaloja LRU al superar el tope"""
+    now = monotonic()
+    _local_cache[key] = (now + ttl, value)
+    _local_cache.move_to_end(key)
+    if len(_local_cache) <= LOCAL_CACHE_MAX_ENTRIES:
+        return
+    for expired_key in [k for k, (expires_at, _) in _local_cache.items() if expires_at <= now]:
+        del _local_cache[expired_key]
+    while len(_local_cache) > LOCAL_CACHE_MAX_ENTRIES:
+        _local_cache.popitem(last=False)
+
+
+# Singleton
+_redis_client = None
+
+def get_redis():
+    """Get or create shared redis.asyncio client (None si Redis no está configurado)"""
+    global _redis_client
+    settings = get_settings()
+    if not settings.REDIS_URL or not REDIS_AVAILABLE:
+        return None
+    if _redis_client is None:
+        import redis.asyncio as aioredis
+
+        _redis_client = aioredis.from_url(
+            settings.REDIS_URL,
+            socket_timeout=1.0,
+            socket_connect_timeout=1.0,
+        )
+        logger.info("🧰 Redis cache client created")
+    return _redis_client
+
+
+async def close_redis() -> None:
+    """Cerrar el cliente compartido (shutdown de la app)"""
+    global _redis_client
+    if _redis_client is not None:
+        await _redis_client.aclose()
+        _redis_client = None
+
+
+async def cache_get_json(key: str) -> Optional[Any]:
+    """Leer un valor JSON del cache (None si no existe o Redis falla)"""
+    client = get_redis()
+    if client is None:
+        entry = _local_cache.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= monotonic():
+            _local_cache.pop(key, None)
+            return None
+        _local_cache.move_to_end(key)
+        return entry[1]
+    try:
+        raw = await client.get(key)
+    except Exception as e:
+        # El cache nunca debe tumbar el request: se degrada a MongoDB
+        logger.warning(f"⚠️ Redis GET {key} failed: {e}")
+        return None
+    return orjson.loads(raw) if raw is not None else None
+
+
+async def cache_set_json(key: str, value: Any, ttl: int) -> None:
+    """Guardar un valor JSON con expiración (SET EX)"""
+    client = get_redis()
+    if client is None:
+        _local_set(key, value, ttl)
+        return
+    try:
+        await client.set(key, orjson.dumps(value), ex=ttl)
+    except Exception as e:
+        logger.warning(f"⚠️ Redis SET {key} failed: {e}")
+
+
+async def cache_delete(*keys: str) -> int:
+    """Invalidar claves (ej: después de una ingesta)"""
+    client = get_redis()
+    if client is None:
+        return sum(_local_cache.pop(key, None) is not None for key in keys)
+    if not keys:
+        return 0
+    try:
+        return await client.delete(*keys)
+    except Exception as e:
+        logger.warning(f"⚠️ Redis DEL {keys} failed: {e}")
+        return 0